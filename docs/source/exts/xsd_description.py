@@ -6,6 +6,13 @@
 from lxml import etree
 
 
+XSD_NAMESPACES = {'xs': 'http://www.w3.org/2001/XMLSchema'}
+
+_schema_tag = "{%s}schema" % XSD_NAMESPACES['xs']
+_complex_type_tag = "{%s}complexType" % XSD_NAMESPACES['xs']
+_documentation_xpath = etree.XPath(".//xs:annotation/xs:documentation", namespaces=XSD_NAMESPACES)
+
+
 class xsd_description(nodes.Admonition, nodes.Element):
     pass
 
@@ -30,7 +37,6 @@ def setup(app):
 
     app.connect("doctree-resolved", process_xsd_description_nodes)
     app.connect("env-purge-doc", purge_xsd_descriptions)
-    print(xsd_description, app)
     return {'version': '0.1'}
 
 
@@ -68,55 +74,68 @@ def purge_xsd_descriptions(app, env, docname):
 
 def process_xsd_description_nodes(app, doctree, fromdocname):
     if not app.config.xsd_description_include_xsd_descriptions:
-        for node in doctree.traverse(xsd_description):
+        # Nothing will be rendered, so don't bother reading any schemata
+        for node in list(doctree.traverse(xsd_description)):
             node.parent.remove(node)
+        return
 
     env = app.builder.env
 
-    schemata = []
+    descriptions = {}
     for xsd in env.config.xsd_description_xsd_paths:
         print("Parsing", xsd)
-        tree = etree.parse(xsd)
-        nsmap = {'xs': 'http://www.w3.org/2001/XMLSchema'}
         component_map = {}
-        for tp in tree.findall("/xs:complexType", nsmap):
-            doc = tp.find(".//xs:annotation/xs:documentation", nsmap)
-            if doc is not None:
-                doc = doc.text
+        for _event, tp in etree.iterparse(xsd, events=('end', ), tag=_complex_type_tag):
+            parent = tp.getparent()
+            # Only named, top-level types are documented components. Nested anonymous
+            # types must be left intact until their enclosing type has been read.
+            if parent is None or parent.tag != _schema_tag:
+                continue
+            doc = _documentation_xpath(tp)
+            if doc:
+                doc = doc[0].text
+            else:
+                doc = None
             tp_name = tp.attrib.get('name')
             tp_name = tp_name.replace("Type", '', 1).lower()
             component_map[tp_name] = doc
-        schemata.append(component_map)
+            # Release this type and everything that preceded it in the schema
+            tp.clear()
+            while tp.getprevious() is not None:
+                del parent[0]
+        # Earlier schemata take precedence over later ones
+        for name, doc in component_map.items():
+            descriptions.setdefault(name, doc)
 
     def find_description(name):
-        name = name.lower()
-        for schema in schemata:
-            try:
-                return schema[name]
-            except KeyError:
-                continue
-        return ''
-
-    for xsd_description_node in doctree.traverse(xsd_description):
-        cls_name_node = xsd_description_node.parent.parent[0]
-        cls_name = cls_name_node.attributes['fullname']
-        desc_text = _(find_description(cls_name))
-        if desc_text:
-            para = nodes.paragraph()
-            para += nodes.Text(desc_text, desc_text)
-            xsd_description_node.append(para)
+        return descriptions.get(name.lower(), '')
+
+    # Collect both node types in one walk, and defer removals until the walk is
+    # done so the tree isn't mutated while it is being traversed.
+    to_remove = []
+    for node in list(doctree.traverse(lambda n: isinstance(n, (xsd_description, desc)))):
+        if isinstance(node, xsd_description):
+            cls_name_node = node.parent.parent[0]
+            cls_name = cls_name_node.attributes['fullname']
+            desc_text = _(find_description(cls_name))
+            if desc_text:
+                para = nodes.paragraph()
+                para += nodes.Text(desc_text, desc_text)
+                node.append(para)
+            else:
+                to_remove.append(node)
         else:
-            xsd_description_node.parent.remove(xsd_description_node)
-
-    # inject an XSD description into every class
-    for desc_node in doctree.traverse(desc):
-        cls_name_node = desc_node[0]
-        cls_name = cls_name_node.attributes['fullname']
-        desc_text = _(find_description(cls_name))
-        if desc_text:
-            para = nodes.paragraph()
-            para += nodes.Text(desc_text, desc_text)
-            xsd_description_node = xsd_description()
-            xsd_description_node += nodes.title(_("XSD Description"), _("XSD Description"))
-            xsd_description_node.append(para)
-            desc_node.append(xsd_description_node)
+            # inject an XSD description into every class
+            cls_name_node = node[0]
+            cls_name = cls_name_node.attributes['fullname']
+            desc_text = _(find_description(cls_name))
+            if desc_text:
+                para = nodes.paragraph()
+                para += nodes.Text(desc_text, desc_text)
+                xsd_description_node = xsd_description()
+                xsd_description_node += nodes.title(_("XSD Description"), _("XSD Description"))
+                xsd_description_node.append(para)
+                node.append(xsd_description_node)
+
+    for node in to_remove:
+        node.parent.remove(node)
@@ -1,26 +1,59 @@
-from .controlled_vocabulary import (
-    ControlledVocabulary, OBOParser,
-    load_psims, load_unimod,
-    obo_cache, OBOCache)
+import importlib
 
-from .mzml import (
-    MzMLWriter, ARRAY_TYPES, compression_map,
-    MZ_ARRAY, INTENSITY_ARRAY, CHARGE_ARRAY,
-    components as mzml_components,
-    default_cv_list as default_mzml_cv_list, compressors)
+from .version import version as __version__
 
-from .mzmlb import MzMLbWriter
 
-from .mzid import (
-    MzIdentMLWriter, default_cv_list as default_mzid_cv_list,
-    components as mzid_components,)
+# The writers and controlled vocabulary machinery pull in heavy dependencies
+# like SQLAlchemy, NumPy, and lxml, so they are imported on first access
+# instead of when :mod:`psims` itself is imported (PEP 562).
+_lazy_attributes = {
+    "ControlledVocabulary": (".controlled_vocabulary", "ControlledVocabulary"),
+    "OBOParser": (".controlled_vocabulary", "OBOParser"),
+    "load_psims": (".controlled_vocabulary", "load_psims"),
+    "load_unimod": (".controlled_vocabulary", "load_unimod"),
+    "obo_cache": (".controlled_vocabulary", "obo_cache"),
+    "OBOCache": (".controlled_vocabulary", "OBOCache"),
+
+    "MzMLWriter": (".mzml", "MzMLWriter"),
+    "ARRAY_TYPES": (".mzml", "ARRAY_TYPES"),
+    "compression_map": (".mzml", "compression_map"),
+    "MZ_ARRAY": (".mzml", "MZ_ARRAY"),
+    "INTENSITY_ARRAY": (".mzml", "INTENSITY_ARRAY"),
+    "CHARGE_ARRAY": (".mzml", "CHARGE_ARRAY"),
+    "mzml_components": (".mzml", "components"),
+    "default_mzml_cv_list": (".mzml", "default_cv_list"),
+    "compressors": (".mzml", "compressors"),
+
+    "MzMLbWriter": (".mzmlb", "MzMLbWriter"),
+
+    "MzIdentMLWriter": (".mzid", "MzIdentMLWriter"),
+    "default_mzid_cv_list": (".mzid", "default_cv_list"),
+    "mzid_components": (".mzid", "components"),
+
+    "checksum_file": (".utils", "checksum_file"),
+    "TableStateMachine": (".utils", "TableStateMachine"),
+}
+
+_lazy_submodules = {
+    "compression", "controlled_vocabulary", "document", "mzid", "mzml",
+    "mzmlb", "transform", "utils", "validation", "xml",
+}
 
-from .version import version as __version__
 
+def __getattr__(name):
+    if name in _lazy_attributes:
+        module_name, attr = _lazy_attributes[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    elif name in _lazy_submodules:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
 
-from .utils import (checksum_file, TableStateMachine)
 
-from . import compression
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) | _lazy_submodules)
 
 
 __all__ = [
@@ -3,24 +3,53 @@
 import os
 
 from collections import namedtuple, deque
-
-from six import string_types as basestring
+from functools import lru_cache
 
 OpenerRecord = namedtuple("OpenerRecord", ('opener', 'extension', 'magic_bytes'))
 
 DEFAULT_OPENER = OpenerRecord(open, None, None)
 
 
+def _is_seekable(stream):
+    seekable = getattr(stream, 'seekable', None)
+    if seekable is not None:
+        return seekable()
+    # Some file-like objects, like :class:`tempfile.SpooledTemporaryFile` before
+    # Python 3.11, can seek without saying so
+    return hasattr(stream, 'tell') and hasattr(stream, 'seek')
+
+
 class OpenerRegistry(object):
     def __init__(self, openers=None, default=DEFAULT_OPENER):
         if openers is None:
             openers = []
         self.openers = deque(openers)
         self.default = default
+        self._reindex()
+
+    def _reindex(self):
+        # Records earlier in :attr:`openers` take precedence, so fill the lookup
+        # tables from the back of the queue forward, letting earlier records
+        # overwrite later ones.
+        self._by_extension = {}
+        self._by_magic_bytes = {}
+        for rank, rec in reversed(list(enumerate(self.openers))):
+            if rec.extension is not None:
+                # Extensions may be registered with or without their leading dot
+                extension = rec.extension
+                if extension[:1] == '.':
+                    extension = extension[1:]
+                self._by_extension[extension] = rec
+            if rec.magic_bytes is not None:
+                self._by_magic_bytes[rec.magic_bytes] = (rank, rec)
+        self._magic_bytes_lengths = sorted({len(m) for m in self._by_magic_bytes})
+        # Sniffing results depend on the registered records, so start a fresh cache
+        self._sniff_path = lru_cache(maxsize=128)(self._sniff_path_uncached)
 
     def add(self, opener, extension=None, magic_bytes=None):
         record = OpenerRecord(opener, extension, magic_bytes)
         self.openers.appendleft(record)
+        self._reindex()
 
     def __iter__(self):
         return iter(self.openers)
@@ -32,36 +61,47 @@ def __getitem__(self, i):
         return self.openers[i]
 
     def by_extension(self, extension):
-        for rec in self:
-            if rec.extension is None:
-                continue
-            if rec.extension == extension:
-                return rec
-        return None
+        if extension and extension[0] == '.':
+            extension = extension[1:]
+        return self._by_extension.get(extension)
 
     def by_magic_bytes(self, bytestring):
-        for rec in self:
-            if rec.magic_bytes is None:
-                continue
-            if bytestring.startswith(rec.magic_bytes):
-                return rec
-        return None
+        best = None
+        for length in self._magic_bytes_lengths:
+            hit = self._by_magic_bytes.get(bytestring[:length])
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        if best is None:
+            return None
+        return best[1]
+
+    def _sniff_path_uncached(self, path, mtime, size):
+        with open(path, 'rb') as fh:
+            bytestring = fh.read(100)
+            return self.by_magic_bytes(bytestring)
 
     def get(self, path):
         opener = None
-        if isinstance(path, basestring):
+        if isinstance(path, (str, bytes, os.PathLike)):
+            path = os.fsdecode(path)
             ext = os.path.splitext(path)[1]
             opener = self.by_extension(ext)
             if opener is None:
-                with open(path, 'rb') as fh:
-                    bytestring = fh.read(100)
-                    opener = self.by_magic_bytes(bytestring)
-        elif hasattr(path, 'read') and hasattr(path, 'tell'):
+                # Key the cached sniff on the file's modification time and size so that
+                # a path whose contents are rewritten is sniffed again.
+                stat = os.stat(path)
+                opener = self._sniff_path(path, stat.st_mtime_ns, stat.st_size)
+        elif hasattr(path, 'read') and _is_seekable(path):
             current = path.tell()
             path.seek(0)
             bytestring = path.read(100)
             path.seek(current)
             opener = self.by_magic_bytes(bytestring)
+        elif hasattr(path, 'peek'):
+            # Pipes and other unseekable streams can still be inspected without
+            # consuming anything if they are buffered.
+            bytestring = path.peek(100)[:100]
+            opener = self.by_magic_bytes(bytestring)
         if opener is None:
             return self.default.opener
         else:
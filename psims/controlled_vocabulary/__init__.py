@@ -1,5 +1,6 @@
 from .controlled_vocabulary import (
-    ControlledVocabulary, obo_cache, OBOCache, load_psims, VocabularyResolverBase, load_unimod)
+    ControlledVocabulary, obo_cache, OBOCache, load_psims, VocabularyResolverBase, load_unimod,
+    clear_cv_cache, prefetch_cvs)
 
 
 from . import unimod
@@ -18,5 +19,6 @@
     "ControlledVocabulary", "obo_cache", "OBOCache", "OBOParser",
     "obo_cache", "load_psims", "unimod", "load_unimod",
     "Entity", "UNIMODEntity", "Reference", "Relationship",
-    "obj_to_xsdtype", "parse_xsdtype", 'VocabularyResolverBase',
+    "obj_to_xsdtype", "parse_xsdtype", 'VocabularyResolverBase', "clear_cv_cache",
+    "prefetch_cvs",
 ]
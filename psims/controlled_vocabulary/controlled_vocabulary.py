@@ -1,14 +1,20 @@
 import os
-import sys
 import re
+import shutil
+import pickle
 import logging
+import tempfile
+import threading
 
-from urllib.request import urlopen, Request
-from typing import Any, Dict, Hashable, Mapping, Callable, Optional, Union, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 
-from six import PY2
+from urllib.parse import urlsplit
+from urllib.request import urlopen, Request
+from typing import Any, Dict, Mapping, Callable, Optional, Tuple, Union, List
 
 from psims.utils import ensure_iterable
+from psims.version import version as psims_version
 from psims.controlled_vocabulary.entity import Entity
 from psims.controlled_vocabulary.relationship import Reference
 
@@ -44,17 +50,37 @@
 }
 
 
+def _normalize_url(url: str):
+    parts = urlsplit(url)
+    return (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'))
+
+
+_normalized_fallback = {_normalize_url(url): opener for url, opener in fallback.items()}
+
+
+def _find_fallback(url: str) -> Optional[Callable]:
+    opener = fallback.get(url)
+    if opener is None:
+        # Tolerate spelling variations of the same URL, like a different case in
+        # the host name or a trailing slash
+        opener = _normalized_fallback.get(_normalize_url(url))
+    return opener
+
+
 def _default_import_resolver(url: str) -> Optional['ControlledVocabulary']:
     if url.endswith("obo"):
         obo_handle = obo_cache.resolve(url)
         return ControlledVocabulary.from_obo(obo_handle)
 
 
+_curie_pattern = re.compile(r"\S+:\S+")
+
+
 def is_curie(text: Union[str, Reference]) -> bool:
     if isinstance(text, Reference):
         text = text.accession
     if isinstance(text, str):
-        return re.match(r"(\S+):(\S+)", text)
+        return _curie_pattern.match(text) is not None
     else:
         return False
 
@@ -84,7 +110,11 @@ class ControlledVocabulary(Mapping[str, Entity]):
     name : str
         A human-friendly name for this controlled vocabulary
     terms : dict
-        The storage for storing the primary mapping from term ID to terms
+        The storage for storing the primary mapping from term ID to terms.
+        The lookup tables used by :meth:`query` and :meth:`search` are built from
+        it on first use and are not rebuilt when it is modified in place, so do not
+        add or remove terms through it. Assigning a new mapping to :attr:`terms`
+        rebuilds them.
     """
 
     id: str
@@ -134,23 +164,59 @@ def __init__(self, terms, id=None, metadata=None, version=None, name=None, impor
         self.name = name
         self.id = id
         self.metadata = metadata
+        self._import_urls = tuple(ensure_iterable(metadata.get('import', ())))
         self.type_definitions = {}
         self._terms = {}
-        self._translation_cache = {}
         self.terms = terms
         self.import_resolver = import_resolver
         self.imports = {}
+        self._import_prefix_index = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The lookup tables and value types are rebuilt when unpickling, and the
+        # import machinery is specific to the process that loaded this vocabulary.
+        for attr in self._derived_tables:
+            state.pop(attr, None)
+        state.pop('import_resolver', None)
+        state['imports'] = {}
+        state['_import_prefix_index'] = {}
+        state['type_definitions'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.import_resolver = _default_import_resolver
+        self._reindex()
 
     def __getitem__(self, key: str) -> Entity:
         '''A wrapper for :meth:`query`'''
         return self.query(key)
 
+    def __contains__(self, key) -> bool:
+        # Test the lookup tables directly instead of letting :class:`Mapping` catch the
+        # :class:`KeyError` from :meth:`query` on every miss.
+        if isinstance(key, Reference):
+            key = key.accession
+        if key in self._terms or key in self._names or key in self._imported_terms:
+            return True
+        if key.lower() in self._lower_index:
+            return True
+        if self._import_urls and is_curie(key):
+            return self._query_imported(key) is not None
+        return False
+
     def query(self, key: str) -> Entity:
         '''
         Search for a term whose id or name matches `key`, or if it is a synonym.
 
         This search is case-insensitive, but case-matching is preferred.
 
+        .. note::
+            The name and synonym tables are built on first use, so changes made to
+            :attr:`terms` in place afterwards are not seen. Assign a new mapping
+            to :attr:`terms` instead.
+
         Parameters
         ----------
         key : str
@@ -173,39 +239,25 @@ def query(self, key: str) -> Entity:
         '''
         if isinstance(key, Reference):
             key = key.accession
-        if key in self._translation_cache:
-            return self._translation_cache[key]
-        if key in self.terms:
-            return self.terms[key]
-        elif key in self._names:
-            return self._names[key]
-        else:
-            try:
-                normalized_key = self.normalize_name(key)
-                if normalized_key in self._names:
-                    val = self._translation_cache[key] = self._names[normalized_key]
-                    return val
-            except KeyError:
-                # Just to have a value to show.
-                normalized_key = key.lower()
-            lower_key = key.lower()
-            if lower_key in self._synonyms:
-                val = self._translation_cache[key] = self._synonyms[lower_key]
-                return val
-            elif lower_key in self.terms:
-                val = self._translation_cache[key] = self.terms[lower_key]
-                return val
-            elif lower_key in self._obsolete_names:
-                val = self._translation_cache[key] = self._obsolete_names[lower_key]
-                return val
-            else:
-                if is_curie(key):
-
-                    result = self._query_imported(key)
-                    if result is not None:
-                        self._translation_cache[key] = result
-                        return result
-                raise KeyError("%s and %s were not found." % (key, normalized_key)) from None
+        term = self._terms.get(key)
+        if term is not None:
+            return term
+        term = self._names.get(key)
+        if term is not None:
+            return term
+        term = self._imported_terms.get(key)
+        if term is not None:
+            return term
+        lower_key = key.lower()
+        term = self._lower_index.get(lower_key)
+        if term is not None:
+            return term
+        if is_curie(key):
+            term = self._query_imported(key)
+            if term is not None:
+                self._imported_terms[key] = term
+                return term
+        raise KeyError("%s and %s were not found." % (key, lower_key))
 
     def search(self, query: str) -> List[Entity]:
         '''
@@ -215,6 +267,11 @@ def search(self, query: str) -> List[Entity]:
         and can be ambiguous when given a common or short substring. For exact
         string matches, use :meth:`query`
 
+        .. note::
+            The lower-cased keys searched are built once, on the first search, so
+            terms added to or removed from :attr:`terms` in place afterwards are
+            not seen. Assign a new mapping to :attr:`terms` instead.
+
         Parameters
         ----------
         query : str
@@ -231,19 +288,11 @@ def search(self, query: str) -> List[Entity]:
         '''
         terms = {}
         query = query.lower()
-        for key in self.terms:
-            if query in key.lower():
-                val = self.terms[key]
+        for key, val in self._search_index:
+            if query in key:
                 terms[val.id] = val
-        for key in self._names:
-            if query in key.lower():
-                val = self._names[key]
-                terms[val.id] = val
-        for key in self._synonyms:
-            if query in key.lower():
-                val = self._synonyms[key]
-                terms[val.id] = val
-        return sorted(terms.values(), key=lambda x: x.id)
+        # The hits are keyed by id already, so sort the keys without a key function
+        return [terms[term_id] for term_id in sorted(terms)]
 
     def __repr__(self):
         template = ("{self.__class__.__name__}(terms={size}, id={self.id}, "
@@ -266,54 +315,107 @@ def terms(self, value):
         self._reindex()
 
     def _reindex(self):
-        self._build_names()
-        self._build_case_normalized()
-        self._build_synonyms()
-        self._bind_terms()
-
-    def _build_names(self):
-        self._names = {
-            v['name']: v for v in self.terms.values()
-            if not v.get("is_obsolete", False) and isinstance(v['name'], Hashable)
-        }
-        self._obsolete_names = {
-            v['name'].lower(): v for v in self.terms.values()
-            if v.get("is_obsolete", False) and isinstance(v['name'], Hashable)
-        }
-
-    def _bind_terms(self):
-        if PY2 or (sys.version_info.major == 3 and sys.version_info.minor < 6):
-            value_typed = []
-            for term in self.terms.values():
-                term.vocabulary = self
-                value_types = term.get('has_value_type')
-                if value_types:
-                    value_typed.append(value_types)
-            for value_types in value_typed:
-                for value_type in value_types:
-                    value_type.make_value_type(self)
-
-        else:
-            for term in self.terms.values():
-                term.vocabulary = self
-                value_types = term.get('has_value_type')
-                if value_types:
-                    for value_type in value_types:
-                        value_type.make_value_type(self)
-
-    def _build_synonyms(self):
-        self._synonyms = {}
+        # Bind each term with the slot descriptors directly rather than going through
+        # :meth:`Entity.__setattr__` for every term.
+        bind_vocabulary = Entity.vocabulary.__set__
+        value_typed = []
         for term in self.terms.values():
-            if term.get('synonym'):
-                for synonym in term.get('synonym'):
-                    self._synonyms[synonym.lower()] = term
-
-    def _build_case_normalized(self):
-        self._normalized = {
-            v['name'].lower(): v['name']
-            for v in self.terms.values()
-            if isinstance(v['name'], str)
-        }
+            bind_vocabulary(term, self)
+            value_types = term.data.get('has_value_type')
+            if value_types:
+                value_typed.append(value_types)
+        # Ancestors are resolved through the bound vocabulary, and terms may have
+        # been added or removed, so retire every memoized ancestor set at once.
+        Entity._invalidate_hierarchy(self)
+        # The name-based lookup tables are only needed when terms are referred to by
+        # something other than their accession, so they are built on first use.
+        for attr in self._derived_tables:
+            self.__dict__.pop(attr, None)
+        # Value types may refer to other terms, so they can only be resolved once
+        # every term is bound.
+        for value_types in value_typed:
+            for value_type in value_types:
+                value_type.make_value_type(self)
+
+    # Exact name lookups are far more common than case-insensitive or synonym lookups,
+    # so the two groups of tables are built separately, each on first use.
+    _exact_name_tables = ('_names', )
+    _fuzzy_name_tables = ('_obsolete_names', '_normalized', '_synonyms', '_lower_index')
+    _name_tables = _exact_name_tables + _fuzzy_name_tables
+    _derived_tables = _name_tables + ('_search_index', '_imported_terms')
+
+    def _build_exact_name_tables(self):
+        names = {}
+        for term in self.terms.values():
+            name = term['name']
+            # A term with several names has a list here, which cannot be indexed
+            if isinstance(name, str) and not term.get("is_obsolete", False):
+                names[name] = term
+        self.__dict__['_names'] = names
+
+    def _build_fuzzy_name_tables(self):
+        names = self._names
+        obsolete_names = {}
+        normalized = {}
+        synonyms = {}
+        for term in self.terms.values():
+            name = term['name']
+            if isinstance(name, str):
+                lower_name = name.lower()
+                if term.get("is_obsolete", False):
+                    obsolete_names[lower_name] = term
+                normalized[lower_name] = name
+            term_synonyms = term.get('synonym')
+            if term_synonyms:
+                for synonym in term_synonyms:
+                    synonyms[synonym.lower()] = term
+
+        # Merge every other way a term may be referred to into one case-insensitive
+        # table so that :meth:`query` needs only one more lookup after trying exact
+        # matches. The table is layered from the lowest to the highest precedence
+        # source with bulk updates, which size the table for each incoming layer up
+        # front instead of growing it one insertion at a time.
+        lower_index = dict(obsolete_names)
+        # Only an accession which is already lower case can match a lower-cased key
+        lower_index.update({key: term for key, term in self.terms.items() if key == key.lower()})
+        lower_index.update(synonyms)
+        lower_index.update({
+            lower_name: names[name] for lower_name, name in normalized.items() if name in names
+        })
+
+        self.__dict__.update(
+            _obsolete_names=obsolete_names, _normalized=normalized,
+            _synonyms=synonyms, _lower_index=lower_index)
+
+    def _lazy_name_table(attr, builder):
+        def build(self):
+            builder(self)
+            return self.__dict__[attr]
+        build.__name__ = attr
+        return cached_property(build)
+
+    _names = _lazy_name_table('_names', _build_exact_name_tables)
+    _obsolete_names = _lazy_name_table('_obsolete_names', _build_fuzzy_name_tables)
+    _normalized = _lazy_name_table('_normalized', _build_fuzzy_name_tables)
+    _synonyms = _lazy_name_table('_synonyms', _build_fuzzy_name_tables)
+    _lower_index = _lazy_name_table('_lower_index', _build_fuzzy_name_tables)
+
+    del _lazy_name_table
+
+    @cached_property
+    def _search_index(self) -> List[Tuple[str, Entity]]:
+        # Lower-case every accession, name, and synonym once so that :meth:`search`
+        # only needs to do substring tests. Synonyms are already lower-cased.
+        index = [(key.lower(), term) for key, term in self.terms.items()]
+        index.extend((name.lower(), term) for name, term in self._names.items())
+        index.extend(self._synonyms.items())
+        return index
+
+    @cached_property
+    def _imported_terms(self) -> Dict[str, Entity]:
+        # Terms found in imported vocabularies by :meth:`query`, kept apart from the
+        # much larger name table so that it does not have to be copied to hold them.
+        return {}
 
     def keys(self):
         return self.terms.keys()
@@ -335,9 +437,22 @@ def items(self):
     def normalize_name(self, name):
         return self._normalized[name.lower()]
 
+    def _index_import_prefixes(self, cv: 'ControlledVocabulary'):
+        prefixes = {accession.split(':', 1)[0] for accession in cv.terms}
+        for prefix in prefixes:
+            self._import_prefix_index.setdefault(prefix, cv)
+
     def _query_imported(self, query):
+        # Try the imported vocabulary which defines terms with this CURIE's prefix
+        # first, before probing every import in turn.
+        cv = self._import_prefix_index.get(query.split(':', 1)[0])
+        if cv is not None:
+            try:
+                return cv.query(query)
+            except KeyError:
+                pass
         term = None
-        for url in ensure_iterable(self.metadata['import']):
+        for url in self._import_urls:
             if url in self.imports:
                 cv = self.imports[url]
             else:
@@ -346,6 +461,8 @@ def _query_imported(self, query):
                     cv = self.imports[url] = self.import_resolver(url)
                 except ValueError:
                     cv = self.imports[url] = None
+                if cv is not None:
+                    self._index_import_prefixes(cv)
             if cv is None:
                 continue
             try:
@@ -401,18 +518,32 @@ class OBOCache(VocabularyResolverBase):
     user_agent_emulation : bool
         Whether or not to try to emulate a web browser's user agent when trying
         to download a controlled vocabulary.
+    precompiled : bool
+        Whether or not to pickle the vocabularies parsed by :meth:`load` next to
+        their cached OBO files, and to use that pickle instead of re-parsing the OBO
+        file while the OBO file is unchanged. Only used when the cache is enabled.
+        Off by default. Unpickling can run arbitrary code, so only turn this on
+        for a cache directory that untrusted users cannot write to.
     """
 
     default_resolvers = {}
 
     def __init__(self, cache_path='.obo_cache', enabled=True, resolvers=None, use_remote=True,
-                 user_agent_emulation=True):
+                 user_agent_emulation=True, precompiled=False):
         self._cache_path = None
+        # Vocabularies are often imported by several others, so keep each one that
+        # has been parsed to share it between them. Vocabularies may be loaded from
+        # several threads at once, so each URI is parsed under its own lock.
+        self._loaded = {}
+        self._load_locks = {}
+        self._load_locks_lock = threading.Lock()
         self.cache_path = cache_path
         self.enabled = enabled
         self.resolvers = resolvers or {}
         self.use_remote = use_remote
         self.user_agent_emulation = user_agent_emulation
+        self.precompiled = precompiled
+        self._session = None
         self._register_default_resolvers()
 
     def _register_default_resolvers(self):
@@ -426,6 +557,7 @@ def cache_path(self):
     @cache_path.setter
     def cache_path(self, value):
         self._cache_path = value
+        self._loaded.clear()
         self.cache_exists = os.path.exists(self.cache_path)
 
     def path_for(self, name, setext=False):
@@ -449,13 +581,29 @@ def path_for(self, name, setext=False):
             The path in the file system cache to use for this name.
         '''
         if not self.cache_exists:
-            os.makedirs(self.cache_path)
+            # Another thread may create the directory first, e.g. in :func:`prefetch_cvs`
+            os.makedirs(self.cache_path, exist_ok=True)
             self.cache_exists = True
         name = os.path.basename(name)
         if not name.endswith(".obo") and setext:
             name += '.obo'
         return os.path.join(self.cache_path, name)
 
+    def _get_session(self):
+        # A shared session lets consecutive downloads from the same host reuse
+        # an open connection instead of paying for a new TCP and TLS handshake.
+        if self._session is None:
+            try:
+                import requests
+            except ImportError:
+                return None
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
     def _open_url(self, uri):
         try:
             if not self.use_remote:
@@ -463,6 +611,23 @@ def _open_url(self, uri):
             headers = {}
             if self.user_agent_emulation:
                 headers['User-Agent'] = DEFAULT_USER_AGENT
+            # requests only speaks HTTP, so other schemes like ftp:// stay with urlopen
+            session = None
+            if urlsplit(uri).scheme in ('http', 'https'):
+                session = self._get_session()
+            if session is not None:
+                response = session.get(uri, headers=headers, stream=True, timeout=30)
+                if response.status_code != 200:
+                    response.close()
+                    raise ValueError("%s did not resolve" % uri)
+                f = response.raw
+                # Let urllib3 undo any transfer compression the server applied
+                f.decode_content = True
+                # urllib3 closes the stream as soon as the body is read, which breaks
+                # readers that check the stream after reaching its end. The caller
+                # closes it instead.
+                f.auto_close = False
+                return f
             req = Request(uri, headers=headers)
             f = urlopen(req)
             code = None
@@ -478,8 +643,9 @@ def _open_url(self, uri):
             if code != 200:
                 raise ValueError("%s did not resolve" % uri)
         except Exception:
-            if uri in fallback:
-                f = fallback[uri]()
+            opener = _find_fallback(uri)
+            if opener is not None:
+                f = opener()
             else:
                 raise ValueError(uri)
         return f
@@ -499,8 +665,9 @@ def fallback(self, uri):
         result : file-like or :const:`None`
             Returns a backup stream, or :const:`None` if no fallback exists.
         '''
-        if uri in fallback:
-            f = fallback[uri]()
+        opener = _find_fallback(uri)
+        if opener is not None:
+            f = opener()
         else:
             logger.warning("Failed to locate fallback for %r", uri)
             f = None
@@ -545,21 +712,21 @@ def resolve(self, uri):
         try:
             if self.enabled:
                 name = self.path_for(uri)
-                if os.path.exists(name) and os.path.getsize(name) > 0:
+                try:
+                    is_cached = os.stat(name).st_size > 0
+                except FileNotFoundError:
+                    is_cached = False
+                if is_cached:
                     return open(name, 'rb')
                 else:
                     with self._open_url(uri) as f:
                         with open(name, 'wb') as cache_f:
-                            n_chars = 0
-                            for i, line in enumerate(f.readlines()):
-                                n_chars += len(line)
-                                cache_f.write(line)
-                            if n_chars < 5:
+                            shutil.copyfileobj(f, cache_f, 2 ** 20)
+                            # The write position is the number of bytes copied, so
+                            # the file does not need to be checked again afterwards.
+                            if cache_f.tell() < 5:
                                 raise ValueError("No bytes written")
-                    if os.path.getsize(name) > 0:
-                        return open(name, 'rb')
-                    else:
-                        raise ValueError("Failed to download file")
+                    return open(name, 'rb')
             else:
                 f = self._open_url(uri)
                 return f
@@ -568,18 +735,85 @@ def resolve(self, uri):
             traceback.print_exc()
             raise
 
+    _pickle_format_version = 2
+
+    def _pickle_header_for(self, name: str):
+        # A pickle is only valid for the OBO file it was parsed from and for the
+        # version of the library and pickle layout that wrote it.
+        stat = os.stat(name)
+        return (self._pickle_format_version, psims_version, stat.st_mtime_ns, stat.st_size)
+
+    def _load_pickled(self, uri: str) -> Optional[ControlledVocabulary]:
+        name = self.path_for(uri)
+        try:
+            with open(name + '.pkl', 'rb') as fh:
+                # The header is stored separately so that a stale pickle is rejected
+                # without unpickling the whole vocabulary.
+                if pickle.load(fh) != self._pickle_header_for(name):
+                    return None
+                cv = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logger.debug("Failed to load pickled vocabulary for %r: %r", uri, err)
+            return None
+        cv.import_resolver = self.load
+        return cv
+
+    def _save_pickled(self, uri: str, cv: ControlledVocabulary):
+        name = self.path_for(uri)
+        fd, tmp_name = tempfile.mkstemp(suffix='.pkl.tmp', dir=self.cache_path)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(self._pickle_header_for(name), fh, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(cv, fh, pickle.HIGHEST_PROTOCOL)
+            # Replace the file in one step so that concurrent readers never see
+            # a partially written pickle.
+            os.replace(tmp_name, name + '.pkl')
+        except Exception as err:
+            logger.warning("Failed to pickle vocabulary for %r: %r", uri, err)
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+
+    def _load_lock_for(self, uri: str) -> threading.RLock:
+        with self._load_locks_lock:
+            lock = self._load_locks.get(uri)
+            if lock is None:
+                lock = self._load_locks[uri] = threading.RLock()
+            return lock
+
     def load(self, uri: str):
         if self.has_custom_resolver(uri):
             return self.resolvers[uri](self)
+        with self._load_lock_for(uri):
+            cv = self._loaded.get(uri)
+            if cv is None:
+                cv = self._load(uri)
+                self._loaded[uri] = cv
+            return cv
+
+    def _load(self, uri: str) -> ControlledVocabulary:
+        is_obo = uri.endswith("obo")
+        precompiled = self.enabled and self.precompiled
+        if is_obo and precompiled:
+            cv = self._load_pickled(uri)
+            if cv is not None:
+                return cv
+        save_pickle = precompiled
         try:
             fh = self.resolve(uri)
         except (ValueError, TypeError):
+            save_pickle = False
             fh = self.fallback(uri)
             if fh is None:
                 raise ValueError(f"Failed to resolve {uri} or via its fall-back")
-        if uri.endswith("obo"):
+        if is_obo:
             with fh:
                 cv = ControlledVocabulary.from_obo(fh, import_resolver=self.load)
+            if save_pickle:
+                self._save_pickled(uri, cv)
             return cv
         else:
             raise ValueError(f"Don't know how to load {uri}")
@@ -627,29 +861,57 @@ def resolve_unimod(cache):
 obo_cache = OBOCache(enabled=False)
 
 
-def configure_obo_store(path):
+def configure_obo_store(path, precompiled=False):
     """
     Specify where the default :class:`OBOCache` instance should cache files to.
 
+    This clears any vocabularies memoized by the ``load_*`` functions.
+
     Parameters
     ----------
     path : :class:`str` or :const:`None`
         The path to store the OBO cache, or :const:`None` disables it.
+    precompiled : bool
+        Whether to also keep pickles of the parsed vocabularies in the cache. See
+        :attr:`OBOCache.precompiled`; only enable this for a trusted directory.
     """
     if path is None:
         obo_cache.enabled = False
     else:
         obo_cache.cache_path = path
         obo_cache.enabled = True
+    obo_cache.precompiled = precompiled
+    clear_cv_cache()
 
 
 def register_resolver(name: str, fn: Callable[[], ControlledVocabulary]):
     """Register a resolver on the default :class:`OBOCache` instance"""
     obo_cache.set_resolver(name, fn)
+    clear_cv_cache()
+
+
+def clear_cv_cache():
+    """
+    Forget the vocabularies memoized by the ``load_*`` functions and the default
+    :class:`OBOCache` instance, so that the next call to each loads a fresh copy.
+    """
+    for loader in _cv_loaders.values():
+        loader.cache_clear()
+    obo_cache._loaded.clear()
 
 
+@lru_cache(maxsize=1)
 def load_psims() -> ControlledVocabulary:
-    """Load the PSI-MS controlled vocabulary"""
+    """
+    Load the PSI-MS controlled vocabulary
+
+    The vocabulary is only loaded once, and every later call returns the same
+    :class:`ControlledVocabulary` instance, as do the other ``load_*`` functions.
+    That instance is shared by every caller in the process, including the writers,
+    so treat it as read-only: adding, removing or editing its terms changes them for
+    everyone. Parse a separate copy with :meth:`ControlledVocabulary.from_obo` to
+    modify it, or call :func:`clear_cv_cache` to load a fresh one.
+    """
     try:
         cv = obo_cache.load(
             ("http://purl.obolibrary.org/obo/ms/psi-ms.obo"))
@@ -660,43 +922,108 @@ def load_psims() -> ControlledVocabulary:
             return ControlledVocabulary.from_obo(cv)
 
 
+@lru_cache(maxsize=1)
 def load_uo():
-    """Load the Unit ontology"""
+    """Load the Unit ontology, shared and read-only like :func:`load_psims`"""
     cv = obo_cache.load("http://purl.obolibrary.org/obo/uo.obo")
     return cv
 
 
+@lru_cache(maxsize=1)
 def load_pato():
+    """Load the PATO phenotype quality ontology, shared and read-only like :func:`load_psims`"""
     cv = obo_cache.load("http://purl.obolibrary.org/obo/pato.obo")
     return cv
 
 
+@lru_cache(maxsize=1)
 def load_xlmod():
-    """Load the XL-MOD cross linking modification controlled vocabulary"""
+    """
+    Load the XL-MOD cross linking modification controlled vocabulary, shared and
+    read-only like :func:`load_psims`
+    """
     cv = obo_cache.load("https://raw.githubusercontent.com/HUPO-PSI/mzIdentML/master/cv/XLMOD.obo")
     return cv
 
 
+@lru_cache(maxsize=1)
 def load_unimod():
-    """Load the UNIMOD protein modification controlled vocabulary"""
+    """
+    Load the UNIMOD protein modification controlled vocabulary, shared and read-only
+    like :func:`load_psims`
+    """
     return obo_cache.load("http://www.unimod.org/obo/unimod.obo")
 
 
+def prefetch_cvs(names: Optional[List[str]] = None, max_workers: int = 4) -> Dict[str, ControlledVocabulary]:
+    """
+    Load several of the common controlled vocabularies concurrently.
+
+    Each vocabulary is independent, so their downloads can overlap instead of
+    waiting on one another. The loaded vocabularies are memoized by their ``load_*``
+    functions, so later calls to e.g. :func:`load_psims` return them immediately.
+
+    The returned vocabularies are the same instances every ``load_*`` call hands
+    out, so they must be treated as read-only, as described in :func:`load_psims`.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        The vocabularies to load, from ``"psi-ms"``, ``"uo"``, ``"pato"``, ``"xlmod"``,
+        ``"unimod"``, ``"bto"``, ``"go"``, ``"psimod"``, and ``"gno"``. Defaults to
+        ``"psi-ms"``, ``"uo"``, ``"pato"``, and ``"xlmod"``.
+    max_workers : int
+        The number of threads to load vocabularies with.
+
+    Returns
+    -------
+    dict
+        A mapping from vocabulary name to the loaded vocabulary.
+    """
+    if names is None:
+        names = ["psi-ms", "uo", "pato", "xlmod"]
+    loaders = [(name, _cv_loaders[name]) for name in names]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [(name, pool.submit(loader)) for name, loader in loaders]
+        return {name: future.result() for name, future in futures}
+
+
+@lru_cache(maxsize=1)
 def load_bto():
+    """Load the BRENDA tissue ontology, shared and read-only like :func:`load_psims`"""
     cv = obo_cache.load("http://www.brenda-enzymes.info/ontology/tissue/tree/update/update_files/BrendaTissueOBO")
     return cv
 
 
+@lru_cache(maxsize=1)
 def load_go():
+    """Load the Gene Ontology, shared and read-only like :func:`load_psims`"""
     cv = obo_cache.load("http://purl.obolibrary.org/obo/go.obo")
     return cv
 
 
+@lru_cache(maxsize=1)
 def load_psimod():
+    """Load the PSI-MOD protein modification ontology, shared and read-only like :func:`load_psims`"""
     cv = obo_cache.load("https://raw.githubusercontent.com/HUPO-PSI/psi-mod-CV/master/PSI-MOD.obo")
     return cv
 
 
+@lru_cache(maxsize=1)
 def load_gno():
+    """Load the GNOme glycan naming and subsumption ontology, shared and read-only like :func:`load_psims`"""
     cv = obo_cache.load("http://purl.obolibrary.org/obo/gno.obo")
     return cv
+
+
+_cv_loaders = {
+    "psi-ms": load_psims,
+    "uo": load_uo,
+    "pato": load_pato,
+    "xlmod": load_xlmod,
+    "unimod": load_unimod,
+    "bto": load_bto,
+    "go": load_go,
+    "psimod": load_psimod,
+    "gno": load_gno,
+}
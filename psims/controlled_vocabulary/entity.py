@@ -1,7 +1,7 @@
-from collections import deque
-from typing import Any, Dict, List, Union, TYPE_CHECKING
+from itertools import count
+from typing import Any, Dict, FrozenSet, List, Sequence, Set, Tuple, Union, TYPE_CHECKING
 
-from collections.abc import Mapping, MutableSequence
+from collections.abc import Mapping
 
 from psims.utils import ensure_iterable
 
@@ -11,31 +11,65 @@
     from psims.controlled_vocabulary.controlled_vocabulary import ControlledVocabulary
     from psims.controlled_vocabulary.relationship import Relationship, Reference
 
-class PredicateList(MutableSequence):
+class PredicateList(list):
+    # Reads go straight to :class:`list`, while every write also adds or removes the
+    # relationships on the parent entity. :class:`list` implements its own mutators
+    # rather than going through item assignment and deletion, so each is overridden.
     def __init__(self, members, parent):
-        self.members = list(members)
+        super().__init__(members)
         self.parent = parent
 
-    def __getitem__(self, i):
-        return self.members[i]
-
     def __setitem__(self, i, v):
-        v = self.parent.add_relationship(v)
-        self.members[i] = v
+        if isinstance(i, slice):
+            replaced = self[i]
+            v = list(v)
+            if i.step not in (None, 1) and len(v) != len(replaced):
+                raise ValueError("attempt to assign sequence of size %d to extended slice of size %d" % (
+                    len(v), len(replaced)))
+            for rel in replaced:
+                self.parent.remove_relationship(rel)
+            v = [self.parent.add_relationship(rel) for rel in v]
+        else:
+            self.parent.remove_relationship(self[i])
+            v = self.parent.add_relationship(v)
+        super().__setitem__(i, v)
 
     def __delitem__(self, i):
-        rel = self.members[i]
-        self.parent.remove_relationship(rel)
-        del self.members[i]
+        removed = self[i] if isinstance(i, slice) else (self[i], )
+        for rel in removed:
+            self.parent.remove_relationship(rel)
+        super().__delitem__(i)
 
-    def __iter__(self):
-        return iter(self.members)
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
 
-    def __len__(self):
-        return len(self.members)
+    def append(self, v):
+        """Add a relationship to the end of the list and to the parent entity"""
+        super().append(self.parent.add_relationship(v))
+
+    def extend(self, values):
+        """Add each relationship in `values` to the end of the list and to the parent entity"""
+        for v in values:
+            self.append(v)
+
+    def insert(self, i, v):
+        """Add a relationship at position `i` of the list and to the parent entity"""
+        super().insert(i, self.parent.add_relationship(v))
+
+    def remove(self, v):
+        """Remove the first relationship equal to `v` from the list and the parent entity"""
+        del self[self.index(v)]
+
+    def pop(self, i=-1):
+        """Remove and return the relationship at position `i`, also removing it from the parent entity"""
+        v = self[i]
+        del self[i]
+        return v
 
-    def insert(self, v):
-        self.members.insert(v)
+    def clear(self):
+        """Remove every relationship in the list from it and from the parent entity"""
+        del self[:]
 
 
 class ValueTypeOf(object):
@@ -73,6 +107,23 @@ class KeyOrAttributeError(KeyError, AttributeError):
     pass
 
 
+# Versions for vocabularies' ``is_a`` hierarchies are drawn from one counter so that
+# an entity moved to another vocabulary can never match a version it didn't see.
+_hierarchy_versions = count(1)
+
+
+def _data_attribute(key):
+    # Reading a frequently used key through a property avoids the failed instance
+    # attribute lookup and exception that precede every :meth:`Entity.__getattr__`.
+    def fget(self):
+        try:
+            return self.data[key]
+        except KeyError:
+            raise KeyOrAttributeError(key) from None
+    fget.__name__ = key
+    return property(fget)
+
+
 class Entity(Mapping):
     '''
     Represent a term in a controlled vocabulary.
@@ -82,8 +133,9 @@ class Entity(Mapping):
 
     Attributes
     ----------
-    children : list of :class:`Entity`
-        Additional entities derived from this one
+    children : list or tuple of :class:`Entity`
+        Additional entities derived from this one. Terms parsed from a file
+        hold a :class:`tuple`
     data : :class:`dict`
         An arbitrary attribute store representing key-value pairs
     vocabulary : :class:`~.ControlledVocabulary`
@@ -95,14 +147,20 @@ class Entity(Mapping):
 
     '''
 
+    # Vocabularies may hold hundreds of thousands of terms, so avoid the cost of a
+    # per-instance ``__dict__`` on top of :attr:`data`.
+    __slots__ = ('data', 'children', 'vocabulary', '_ancestors')
+
     data: Dict[str, Any]
-    children: List['Entity']
+    children: Sequence['Entity']
     vocabulary: 'ControlledVocabulary'
 
     def __init__(self, vocabulary=None, **attributes):
-        self.data = dict(attributes)
-        self.children = []
-        self.vocabulary = vocabulary
+        # A new entity has no descendants yet, so there is nothing to invalidate
+        object.__setattr__(self, 'data', dict(attributes))
+        object.__setattr__(self, 'children', [])
+        object.__setattr__(self, 'vocabulary', vocabulary)
+        object.__setattr__(self, '_ancestors', None)
 
     def __eq__(self, other: 'Entity'):
         try:
@@ -113,6 +171,14 @@ def __eq__(self, other: 'Entity'):
     def __ne__(self, other: 'Entity'):
         return not self == other
 
+    def __getstate__(self):
+        return {"data": self.data, "children": self.children, "vocabulary": self.vocabulary}
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, '_ancestors', None)
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
@@ -123,6 +189,8 @@ def __getitem__(self, key):
         return self.data[key]
 
     def __setitem__(self, key, value):
+        if key == 'is_a':
+            self._invalidate_ancestors()
         self.data[key] = value
 
     def __getattr__(self, key):
@@ -132,15 +200,37 @@ def __getattr__(self, key):
             raise KeyOrAttributeError(key) from None
 
     def __setattr__(self, key, value):
-        if key in ("vocabulary", "children", "data"):
+        if key == "data":
+            if value.get('is_a') != self.data.get('is_a'):
+                self._invalidate_ancestors()
+            object.__setattr__(self, key, value)
+        elif key == "vocabulary":
+            # Only this entity's own ancestors were resolved through the old vocabulary
+            object.__setattr__(self, '_ancestors', None)
+            object.__setattr__(self, key, value)
+        elif key == "children":
             object.__setattr__(self, key, value)
         else:
             self[key] = value
 
+    def _invalidate_ancestors(self):
+        object.__setattr__(self, '_ancestors', None)
+        if self.vocabulary is not None:
+            Entity._invalidate_hierarchy(self.vocabulary)
+
+    @staticmethod
+    def _invalidate_hierarchy(vocabulary):
+        # Memoized ancestor sets record the version of their vocabulary's hierarchy
+        # they were built under, so a change to one term's ``is_a`` also retires the
+        # sets of its descendants, while other vocabularies keep theirs.
+        vocabulary._hierarchy_version = next(_hierarchy_versions)
+
     def add_relationship(self, relationship: Union[str, 'Relationship']) -> 'Relationship':
         from .relationship import Relationship
         if isinstance(relationship, str):
             relationship = Relationship.fromstring(relationship)
+        if relationship.predicate == 'is_a':
+            self._invalidate_ancestors()
         self.setdefault(relationship.predicate, [])
         self[relationship.predicate].append(relationship)
         relationships = self.get('relationship')
@@ -150,20 +240,22 @@ def add_relationship(self, relationship: Union[str, 'Relationship']) -> 'Relatio
             relationships = [relationships, relationship]
             self['relationship'] = relationships
         else:
-            self['relationship'] = relationship
+            self['relationship'] = [relationship]
         return relationship
 
     def remove_relationship(self, relationship: Union[str, 'Relationship']):
         from .relationship import Relationship
         if isinstance(relationship, str):
             relationship = Relationship.fromstring(relationship)
+        if relationship.predicate == 'is_a':
+            self._invalidate_ancestors()
         predicate_members = self.get(relationship.predicate, [])
         predicate_members.remove(relationship)
         relationships = self.get('relationship')
         if isinstance(relationships, list):
             relationships.remove(relationship)
         elif relationship == relationships:
-            self.pop('relationship')
+            self['relationship'] = []
         else:
             raise ValueError("Could not find %r" % relationship)
 
@@ -194,6 +286,17 @@ def items(self):
     def setdefault(self, key, value):
         self.data.setdefault(key, value)
 
+    id = _data_attribute('id')
+    name = _data_attribute('name')
+    is_a = _data_attribute('is_a')
+
+    @property
+    def relationship(self) -> PredicateList:
+        # Edits made through the returned list also keep the per-predicate lists, like
+        # ``has_units``, in sync. Entities built by hand may not have a relationship
+        # list yet.
+        return PredicateList(self.data.get('relationship', ()), self)
+
     @property
     def definition(self):
         return self.data.get("def", '')
@@ -241,14 +344,66 @@ def is_of_type(self, tp: Union[str, 'Entity']) -> bool:
                 tp = self.vocabulary[tp]
             except KeyError:
                 return False
-        stack = deque([self])
-        while stack:
-            ref = stack.pop()
-            if ref == tp:
+        ids, external = self._ancestor_closure()
+        if tp.id in ids:
+            return True
+        # Parents outside this entity's vocabulary, like imported terms, are only
+        # resolved when the answer isn't found locally, and dangling ones are skipped.
+        for reference in external:
+            try:
+                parent = self.vocabulary[reference]
+            except KeyError:
+                continue
+            if parent.is_of_type(tp):
                 return True
-            stack.extend(ensure_iterable(ref.parent()))
         return False
 
+    def _ancestor_closure(self) -> Tuple[FrozenSet[str], FrozenSet['Reference']]:
+        # Remember every id reachable through ``is_a`` within this entity's own
+        # vocabulary, including its own id, so that repeated :meth:`is_of_type`
+        # tests are set lookups, along with the references to parents that are not
+        # in the vocabulary. Each parent's sets are memoized too, so the ancestors
+        # shared by many terms are only collected once.
+        ids, external, _complete = self._collect_ancestors(set())
+        return ids, external
+
+    def _collect_ancestors(self, visiting: Set[str]) -> Tuple[FrozenSet[str], FrozenSet['Reference'], bool]:
+        # Vocabularies are shared between threads, so nothing is memoized until it
+        # is complete. The ids on the current path are tracked in ``visiting`` so
+        # that a cycle in the ``is_a`` graph terminates, and the sets cut short by
+        # a cycle are returned without being memoized.
+        version = getattr(self.vocabulary, '_hierarchy_version', 0)
+        ancestors = self._ancestors
+        if ancestors is not None and ancestors[0] == version:
+            return ancestors[1], ancestors[2], True
+        own_id = self.id
+        if own_id in visiting:
+            return frozenset(), frozenset(), False
+        visiting.add(own_id)
+        ids = {own_id}
+        external = set()
+        complete = True
+        try:
+            is_a = self.data.get('is_a')
+            if is_a is not None:
+                terms = self.vocabulary.terms
+                for reference in ensure_iterable(is_a):
+                    parent = terms.get(reference)
+                    if parent is None:
+                        external.add(reference)
+                        continue
+                    parent_ids, parent_external, parent_complete = parent._collect_ancestors(visiting)
+                    ids.update(parent_ids)
+                    external.update(parent_external)
+                    complete = complete and parent_complete
+        finally:
+            visiting.discard(own_id)
+        ids = frozenset(ids)
+        external = frozenset(external)
+        if complete:
+            object.__setattr__(self, '_ancestors', (version, ids, external))
+        return ids, external, complete
+
     def as_value_type(self) -> Union[ListOfType, TypeDefinition]:
         if self.id in self.vocabulary.type_definitions:
             return self.vocabulary.type_definitions[self.id]
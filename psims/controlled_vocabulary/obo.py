@@ -1,8 +1,12 @@
+import gzip
 import io
+import re
+import sys
 from typing import DefaultDict, Dict, List, Optional, Any
 import warnings
 
 from collections import defaultdict
+from functools import lru_cache
 
 from six import string_types as basestring
 
@@ -13,6 +17,23 @@
 from .type_definition import parse_xsdtype, type_inference_guess
 
 
+# Streams which are known to stay open until they are closed, so they can be read through
+# a text layer. Others, like HTTP responses, may close themselves as soon as their last
+# byte is read, which the text layer treats as an error.
+_buffered_stream_types = (io.BufferedReader, io.BufferedRandom, io.BytesIO, gzip.GzipFile)
+
+
+stanza_types = {
+    "[Term]": "term",
+    "[Typedef]": "typedef",
+}
+
+
+# Only a handful of XSD type names appear in any vocabulary, but they are resolved
+# for every typed xref and property value.
+_parse_xsdtype = lru_cache(maxsize=128)(parse_xsdtype)
+
+
 synonym_scopes = {
     "EXACT",
     "BROAD",
@@ -21,7 +42,20 @@
 }
 
 
+# Matches the usual ``"text" SCOPE... [references]`` form of a synonym in one pass.
+# Anything else is left to the character-level parser below.
+_synonym_pattern = re.compile(r'^[^"]*"([^"]*)" ((?:[^ \["]+ )*)\[([^\]"]*)\]')
+
+
 def _synonym_parser(text):
+    match = _synonym_pattern.match(text)
+    if match is not None:
+        synonym, scopes, references = match.groups()
+        return synonym, scopes.split(' ')[:-1], references
+    return _synonym_parser_slow(text)
+
+
+def _synonym_parser_slow(text):
     state = None
     quoted_chars = []
     scopes = []
@@ -101,6 +135,10 @@ def __init__(self, handle, type_inference_rules=None):
         self.current_term = None
         self.header = defaultdict(list)
         self.type_inference_rules = type_inference_rules
+        # The same parent or relationship line is repeated by many terms, so each
+        # distinct line is parsed once and the result shared.
+        self._reference_cache = {}
+        self._relationship_cache = {}
         self.parse()
 
     @property
@@ -133,47 +171,72 @@ def pack(self):
         -------
         :class:`~.Entity`
         """
-        if self.current_term is None:
+        data = self.current_term
+        if data is None:
             return
-        self.current_term['_class'] = self.term_type
-        entity = Entity(self, **{k: v[0] if len(v) == 1 else v for k, v in self.current_term.items()})
-        self._expand_is_a(entity)
-        self._expand_synonym(entity)
+        data['_class'] = self.term_type
+        entity = Entity(self)
+        # A new entity has no memoized ancestors to retire
+        Entity.data.__set__(entity, data)
+        # The expansions below work on ``data`` directly rather than going through
+        # the :class:`~.Entity` mapping methods for every tag of every term, and the
+        # optional ones are skipped entirely for terms without their tag.
+        if 'is_a' in data:
+            self._expand_is_a(entity)
+        if 'synonym' in data:
+            self._expand_synonym(entity)
         self._expand_xref(entity)
-        self._expand_property_value(entity)
+        if 'property_value' in data:
+            self._expand_property_value(entity)
         self._expand_relationship(entity)
-        self.terms[entity['id']] = entity
+        term_id = data['id'] = sys.intern(data['id'])
+        self.terms[term_id] = entity
         self.current_term = None
 
     def _expand_is_a(self, entity):
-        if "is_a" in entity.data:
-            is_as = entity['is_a']
+        data = entity.data
+        if "is_a" in data:
+            is_as = data['is_a']
             if isinstance(is_as, basestring):
-                is_as = Reference.fromstring(is_as)
+                is_as = self._make_reference(is_as)
             else:
-                is_as = list(map(Reference.fromstring, is_as))
-            entity['is_a'] = is_as
+                is_as = list(map(self._make_reference, is_as))
+            data['is_a'] = is_as
+
+    def _make_reference(self, text):
+        reference = self._reference_cache.get(text)
+        if reference is None:
+            reference = self._reference_cache[text] = Reference.fromstring(text)
+        return reference
+
+    def _make_relationship(self, text):
+        relationship = self._relationship_cache.get(text)
+        if relationship is None:
+            relationship = self._relationship_cache[text] = Relationship.fromstring(text)
+        return relationship
 
     def _expand_relationship(self, entity):
-        if 'relationship' in entity.data:
-            relationships = entity['relationship']
-            if not isinstance(relationships, list):
-                relationships = [relationships]
-            relationships = [Relationship.fromstring(r) for r in relationships]
-            entity.data['relationship'] = relationships
+        data = entity.data
+        if 'relationship' in data:
+            relationships = data['relationship']
+            if isinstance(relationships, list):
+                relationships = [self._make_relationship(r) for r in relationships]
+            else:
+                # A single relationship tag is stored as a bare string
+                relationships = [self._make_relationship(relationships)]
+            data['relationship'] = relationships
             for rel in relationships:
-                entity.setdefault(rel.predicate, [])
-                entity[rel.predicate].append(rel)
+                data.setdefault(rel.predicate, []).append(rel)
         else:
-            entity.data['relationship'] = []
+            data['relationship'] = []
 
     def _expand_synonym(self, entity):
-        if 'synonym' in entity.data:
-            synonyms = entity['synonym']
+        data = entity.data
+        if 'synonym' in data:
+            synonyms = data['synonym']
             if not isinstance(synonyms, list):
                 synonyms = [synonyms]
-            synonyms = list(map(synonym_parser, synonyms))
-            entity['synonym'] = synonyms
+            data['synonym'] = list(map(synonym_parser, synonyms))
 
     def _infer_type(self, key, value):
         rule = self.type_inference_rules.get(key)
@@ -184,21 +247,20 @@ def _infer_type(self, key, value):
         return value
 
     def _expand_xref(self, entity):
-        entity.value_type = None
-        if 'xref' in entity.data:
-            xref = entity['xref']
+        data = entity.data
+        data['value_type'] = None
+        if 'xref' in data:
+            xref = data['xref']
             if isinstance(xref, basestring):
                 xref = [xref]
             for x in xref:
-                try:
-                    key, value = x.split(":", 1)
-                except ValueError:
+                key, sep, value = x.partition(":")
+                if not sep:
                     key, value = x.split(' \"', 1)
                     value = '\"' + value
                 if key == 'value-type':
                     rel = self._get_value_type(x)
-                    entity.setdefault(rel.predicate, [])
-                    entity[rel.predicate].append(rel)
+                    data.setdefault(rel.predicate, []).append(rel)
                 else:
                     if value.startswith("\""):
                         try:
@@ -208,7 +270,7 @@ def _expand_xref(self, entity):
                             dtype = None
                         value = value.strip()
                         if dtype is not None:
-                            dtype, _ = parse_xsdtype(dtype)
+                            dtype, _ = _parse_xsdtype(dtype)
                         if dtype is not None:
                             value = dtype(value[1:-1])
                         else:
@@ -216,22 +278,23 @@ def _expand_xref(self, entity):
                     else:
                         value = value.strip()
                         value = self._infer_type(key, value)
-                    entity[key] = value
+                    data[key] = value
 
     def _expand_property_value(self, entity):
-        if "property_value" in entity.data:
-            for prop_val in ensure_iterable(entity.data['property_value']):
+        data = entity.data
+        if "property_value" in data:
+            for prop_val in ensure_iterable(data['property_value']):
                 prop, val = prop_val.split(" ", 1)
                 prop = prop.strip(": ")
                 val = val.strip()
                 if val.startswith("\""):
                     val, dtype = val.rsplit(" ", 1)
-                    dtype, _ = parse_xsdtype(dtype)
+                    dtype, _ = _parse_xsdtype(dtype)
                     try:
                         val = dtype(val[1:-1])
                     except (ValueError, TypeError):
                         pass
-                entity[prop] = val
+                data[prop] = val
 
     def _connect_parents(self):
         """Walk the semantic graph up the parent hierarchy, binding child
@@ -239,23 +302,29 @@ def _connect_parents(self):
         """
         term: Entity
         rel: Relationship
-        for term in self.terms.values():
-            try:
-                if isinstance(term.is_a, Reference):
-                    self.terms[term.is_a].children.append(term)
-                else:
-                    for is_a in term.is_a:
-                        self.terms[is_a].children.append(term)
-            except KeyError:
-                pass
-            try:
-                for rel in term.relationship:
-                    if rel.predicate == 'part_of':
-                        larger = self.terms[rel.accession]
+        terms = self.terms
+        # Parents outside this vocabulary, e.g. from imports, are common, so
+        # look them up rather than letting a KeyError unwind each term.
+        for term in terms.values():
+            is_a = term.data.get('is_a')
+            if is_a is not None:
+                if isinstance(is_a, Reference):
+                    is_a = (is_a, )
+                for reference in is_a:
+                    parent = terms.get(reference)
+                    if parent is not None:
+                        parent.children.append(term)
+            # Read the stored list rather than the editable copy made by the property
+            for rel in term.data['relationship']:
+                if rel.predicate == 'part_of':
+                    larger = terms.get(rel.accession)
+                    if larger is not None:
                         larger.setdefault('parts', [])
                         larger.parts.append(term)
-            except KeyError:
-                pass
+        # The hierarchy is complete, so trade each term's growable list for a
+        # tuple. Most terms are leaves and then share the empty tuple.
+        for term in self.terms.values():
+            term.children = tuple(term.children)
 
     def _pack_if_occupied(self):
         if self.current_term is not None:
@@ -263,36 +332,77 @@ def _pack_if_occupied(self):
 
     def _simplify_header_information(self):
         self.header = {
-            k: v if len(v) > 1 else v[0] for k, v in self.header.items()
+            k: [x.strip() for x in v] if len(v) > 1 else v[0].strip()
+            for k, v in self.header.items()
         }
 
+    def _iter_lines(self):
+        handle = self.handle
+        if isinstance(handle, _buffered_stream_types):
+            # Decode in bulk in the text layer rather than decoding every line separately
+            reader = io.TextIOWrapper(handle, encoding='utf-8', newline='\n')
+            try:
+                # Not ``yield from``, which would pass closing this generator early on
+                # to the wrapper, and so close the underlying stream too
+                for line in reader:
+                    yield line
+            finally:
+                # Leave closing the underlying stream to :meth:`parse` or the caller
+                reader.detach()
+        else:
+            for line in handle:
+                yield line.decode('utf-8')
+
     def parse(self):
         """Iteratively parse a binary file stream for an OBO file into a
         semantic graph.
         """
         in_header = True
-        for line in self.handle.readlines():
-            line = line.decode('utf-8')
-            line = line.strip()
-            if not line:
-                in_header = False
-                continue
-            elif in_header:
-                key, val = line.split(":", 1)
-                self.header[key].append(val.strip())
-            elif line == "[Typedef]":
-                self._pack_if_occupied()
-                self.current_term = defaultdict(list)
-                self.term_type = "typedef"
-            elif line == "[Term]":
-                self._pack_if_occupied()
-                self.current_term = defaultdict(list)
-                self.term_type = 'term'
-            else:
-                if self.current_term is None:
+        lines = self._iter_lines()
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    in_header = False
                     continue
-                key, sep, val = line.partition(":")
-                self.current_term[key].append(val.strip())
+                elif in_header:
+                    key, val = line.split(":", 1)
+                    # Values are stripped once the header is simplified
+                    self.header[key].append(val)
+                elif line[0] == "[" and line in stanza_types:
+                    # Only stanza headers start with a bracket, so tag-value lines skip
+                    # the header comparison entirely.
+                    self._pack_if_occupied()
+                    self.current_term = {}
+                    self.term_type = stanza_types[line]
+                else:
+                    current_term = self.current_term
+                    if current_term is None:
+                        continue
+                    i = line.find(":")
+                    if i < 0:
+                        key = line
+                        val = ''
+                    else:
+                        key = line[:i]
+                        # The line is already stripped, so only leading space remains
+                        val = line[i + 1:].lstrip()
+                    # Every term repeats the same handful of tags, so share one copy
+                    # of each instead of keeping a fresh string per line.
+                    key = sys.intern(key)
+                    # Most tags occur once per term, so only build a list for repeated tags
+                    existing = current_term.get(key)
+                    if existing is None:
+                        current_term[key] = val
+                    elif isinstance(existing, list):
+                        existing.append(val)
+                    else:
+                        current_term[key] = [existing, val]
+        finally:
+            # Finish the line reader here, not whenever it is garbage collected, so
+            # that it has let go of the handle before an error leaves this method
+            lines.close()
+
         self.pack()
         self._connect_parents()
         self._simplify_header_information()
@@ -310,49 +420,43 @@ def __init__(self, stream):
         self.stream = stream
 
     def write_header(self, header):
+        parts = []
         for key, value in header.items():
             if isinstance(value, (list, tuple)):
                 for v in value:
-                    self.stream.write("%s: %s\n" % (key, v))
+                    parts.append("%s: %s\n" % (key, v))
             else:
-                self.stream.write("%s: %s\n" % (key, value))
-        self.stream.write("\n")
+                parts.append("%s: %s\n" % (key, value))
+        parts.append("\n")
+        self.stream.write(''.join(parts))
+
+    def _format_synonyms(self, term, parts):
+        seen = set()
+        for syn in ensure_iterable(term.get('synonyms', [])):
+            if syn in seen:
+                continue
+            seen.add(syn)
+            parts.append("synonym: \"%s\" EXACT\n" % str(syn).replace("\n", "\\n"))
 
     def write_term(self, term):
+        # Each stanza is assembled in full and written to the stream at once
+        parts = []
         if term._class == 'term':
-            self.stream.write("[Term]\nid: %s\nname: %s\n" %
-                        (term.id, term.name, ))
+            parts.append("[Term]\nid: %s\nname: %s\n" % (term.id, term.name, ))
             if term.definition:
-                self.stream.write("def: %s\n" % (term.definition, ))
-            seen = set()
-            for syn in ensure_iterable(term.get('synonyms', [])):
-                if syn in seen:
-                    continue
-                seen.add(syn)
-                self.stream.write("synonym: \"%s\" EXACT\n" % str(syn).replace("\n", "\\n"))
+                parts.append("def: %s\n" % (term.definition, ))
+            self._format_synonyms(term, parts)
             for xref in ensure_iterable(term.get('xref', [])):
-                self.stream.write("xref: %s\n" % str(xref))
+                parts.append("xref: %s\n" % str(xref))
             for is_a in ensure_iterable(term.get("is_a", [])):
-                self.stream.write("is_a: %s\n" % str(is_a))
-            for rel in ensure_iterable(term.get("relationship", [])):
-                self.stream.write("relationship: %s\n" % str(rel))
-            for prop in ensure_iterable(term.get('property_value', [])):
-                self.stream.write("property_value: %s\n" % prop)
-            self.stream.write("\n")
+                parts.append("is_a: %s\n" % str(is_a))
         elif term._class == "typedef":
-            self.stream.write("[Typedef]\nid: %s\nname: %s\n" %
-                              (term.id, term.name, ))
+            parts.append("[Typedef]\nid: %s\nname: %s\n" % (term.id, term.name, ))
             if term.definition:
-                self.stream.write("def: %s\n" % term.definition)
-            seen = set()
-            for syn in ensure_iterable(term.get('synonyms', [])):
-                if syn in seen:
-                    continue
-                seen.add(syn)
-                self.stream.write("synonym: \"%s\" EXACT\n" %
-                                  str(syn).replace("\n", "\\n"))
+                parts.append("def: %s\n" % term.definition)
+            self._format_synonyms(term, parts)
             for xref in ensure_iterable(term.get('xref', [])):
-                self.stream.write("xref: %s\n" % str(xref))
+                parts.append("xref: %s\n" % str(xref))
             keys = ['domain', 'range', 'is_anti_symmetric', 'is_cyclic',
                     'is_reflexive', 'is_symmetric', 'is_transitive', 'is_a',
                     'transitive_over']
@@ -364,12 +468,15 @@ def write_term(self, term):
                             d = 'true'
                         elif d is False:
                             d = 'false'
-                    self.stream.write("%s: %s\n" % (key, d))
-            for rel in ensure_iterable(term.get("relationship", [])):
-                self.stream.write("relationship: %s\n" % str(rel))
-            for prop in ensure_iterable(term.get('property_value', [])):
-                self.stream.write("property_value: %s\n" % prop)
-            self.stream.write("\n")
+                    parts.append("%s: %s\n" % (key, d))
+        else:
+            return
+        for rel in ensure_iterable(term.get("relationship", [])):
+            parts.append("relationship: %s\n" % str(rel))
+        for prop in ensure_iterable(term.get('property_value', [])):
+            parts.append("property_value: %s\n" % prop)
+        parts.append("\n")
+        self.stream.write(''.join(parts))
 
     def write_vocabulary(self, vocabulary):
         self.write_header(vocabulary.metadata)
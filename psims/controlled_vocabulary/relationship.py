@@ -1,9 +1,17 @@
 import re
+import sys
 from typing import Optional
 
 from .type_definition import TypeDefinition, ListOfType, parse_xsdtype
 
+_relationship_pattern = re.compile(
+    r"(?P<predicate>\S+):?\s(?P<accession>\S+)\s?(?:!\s(?P<comment>.*))?")
+
+
 class SemanticEdge(object):
+    # One edge is made for every ``is_a`` and relationship in a vocabulary
+    __slots__ = ('accession', 'comment')
+
     accession: str
     comment: str
 
@@ -34,22 +42,29 @@ def __hash__(self):
 
 
 class Reference(SemanticEdge):
+    __slots__ = ()
+
     @classmethod
     def fromstring(cls, string):
         try:
             accession, comment = map(lambda s: s.strip(), string.split("!"))
-            return cls(accession, comment)
         except Exception:
-            return cls(string)
+            return cls(sys.intern(string))
+        # The same few accessions are referenced over and over, and interning lets
+        # them share the referenced term's own id string.
+        return cls(sys.intern(accession), comment)
 
 
 class Relationship(SemanticEdge):
+    __slots__ = ('predicate', )
+
     dispatch = {}
 
     predicate: str
 
     def __init__(self, predicate: str, accession: str, comment: Optional[str]=None):
-        self.predicate = predicate.strip(":")
+        # Predicates come from a small set of names, so keep one copy of each
+        self.predicate = sys.intern(predicate.strip(":"))
         self.accession = accession
         self.comment = comment
 
@@ -61,19 +76,26 @@ def __repr__(self):
 
     @classmethod
     def fromstring(cls, string: str):
-        groups_match = re.search(
-            r"(?P<predicate>\S+):?\s(?P<accession>\S+)\s?(?:!\s(?P<comment>.*))?",
-            string)
+        # Nearly every relationship is written as ``predicate accession ! comment``,
+        # which splitting handles without a regular expression match.
+        head, sep, comment = string.partition(" ! ")
+        parts = head.split(" ")
+        if len(parts) == 2 and parts[0] and parts[1]:
+            predicate, accession = parts
+            if not sep:
+                comment = None
+            return cls.dispatch.get(predicate, cls)(predicate, sys.intern(accession), comment)
+        groups_match = _relationship_pattern.search(string)
         if groups_match is None:
             raise ValueError("Could not parse relationship from %r" % string)
         else:
-            groups = groups_match.groupdict()
-            if groups['predicate'] in cls.dispatch:
-                return cls.dispatch[groups['predicate']](**groups)
-            return cls(**groups)
+            predicate, accession, comment = groups_match.groups()
+            return cls.dispatch.get(predicate, cls)(predicate, sys.intern(accession), comment)
 
 
 class HasValueTypeRelationship(Relationship):
+    __slots__ = ('value_type', )
+
     name = "has_value_type"
 
     value_type: Optional[TypeDefinition]
@@ -83,6 +105,16 @@ def __init__(self, predicate, accession, comment=None):
             predicate, accession, comment=comment)
         self.value_type = None
 
+    def __getstate__(self):
+        # Type converters may be closures, so they are re-created by the vocabulary
+        # when it is unpickled instead.
+        return (None, {
+            'predicate': self.predicate,
+            'accession': self.accession,
+            'comment': self.comment,
+            'value_type': None,
+        })
+
     def make_value_type(self, vocabulary):
         # We have a built-in data type with known semantics
         if 'xsd' in self.accession:
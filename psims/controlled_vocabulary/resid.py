@@ -4,10 +4,7 @@
 import io
 
 from collections import Counter
-try:
-    from urllib2 import urlopen, URLError, Request
-except ImportError:
-    from urllib.request import urlopen, URLError, Request
+from urllib.request import urlopen
 
 from lxml import etree
 
@@ -31,6 +28,8 @@ def _make_isotope_string(element, isotope):
 
 RESID_SOURCE_URL = "ftp://ftp.proteininformationresource.org/pir_databases/other_databases/resid/RESIDUES.XML"
 
+_formula_pattern = re.compile(r"(\S+)\s(\d+)")
+
 
 def fetch(source_url=None):
     if source_url is None:
@@ -95,7 +94,8 @@ def _parse_mass(cls, text):
     @classmethod
     def _parse_formula(self, formula):
         composition = CompositionType()
-        for key, val in re.findall(r"(\S+)\s(\d+)", formula):
+        for match in _formula_pattern.finditer(formula):
+            key, val = match.groups()
             composition[key] += int(val)
         return composition
 
@@ -111,6 +111,8 @@ def from_xml(cls, tag):
 
 
 class RESIDEntity(Entity):
+    __slots__ = ()
+
     def is_of_type(self, tp):
         try:
             if tp.startswith('RESID'):
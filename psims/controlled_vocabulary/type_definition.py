@@ -104,6 +104,10 @@ def parse_xsdtype(text):
     converter : :class:`~.Callable`
     formatter: :class:`~.Callable`
     """
+    # Most text handed in is not an XSD type at all, and a substring test rules
+    # that out without running the regular expression.
+    if "xsd" not in text:
+        return str, str
     match = xsd_pattern.search(text)
     if match:
         dtype_name = match.group(1).strip()
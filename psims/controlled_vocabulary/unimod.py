@@ -42,6 +42,10 @@ def _make_isotope_string(element, isotope):
             return str(element)
 
 
+_formula_token_pattern = re.compile(r"(?P<isotope>\d+)?(?P<elemet>[^\(]+)(?:\((?P<count>-?\d+)\))?")
+_isotope_symbol_pattern = re.compile(r"(?P<isotope>\d+)?(?P<element>\S+)")
+
+
 model_registry = set()
 
 class SubclassRegisteringDeclarativeMeta(DeclarativeMeta):
@@ -139,7 +143,7 @@ def _formula_parser(formula, session):
     '''
     composition = CompositionType()
     for token in formula.split(" "):
-        match = re.search(r"(?P<isotope>\d+)?(?P<elemet>[^\(]+)(?:\((?P<count>-?\d+)\))?", token)
+        match = _formula_token_pattern.search(token)
         if match:
             isotope, element, count = match.groups()
             if count is not None:
@@ -341,7 +345,7 @@ def composition(self):
         composition = CompositionType()
         for element_relation in self.elements:
             symbol = element_relation.element
-            isotope, element = re.search(r"(?P<isotope>\d+)?(?P<element>\S+)", symbol).groups()
+            isotope, element = _isotope_symbol_pattern.search(symbol).groups()
             if isotope:
                 isotope = int(isotope)
                 iso_str = _make_isotope_string(element, isotope)
@@ -377,7 +381,7 @@ def composition(self):
         session = object_session(self)
         for fragment_composition_relation in self._fragment_composition:
             symbol = fragment_composition_relation.brick_string
-            isotope, element = re.search(r"(?P<isotope>\d+)?(?P<element>\S+)", symbol).groups()
+            isotope, element = _isotope_symbol_pattern.search(symbol).groups()
             count = fragment_composition_relation.count
             if count is not None:
                 count = int(count)
@@ -832,6 +836,7 @@ def load(path=None):
 
 
 class UNIMODEntity(Entity):
+    __slots__ = ()
 
     def is_of_type(self, tp):
         try:
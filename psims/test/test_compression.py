@@ -0,0 +1,77 @@
+import gzip
+import io
+import os
+import tempfile
+
+from psims import compression
+
+
+class UnseekableStream(io.RawIOBase):
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def readinto(self, buffer):
+        chunk = self.data.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+class LegacySeekableStream(object):
+    # Seeks, but has no seekable method, like SpooledTemporaryFile before Python 3.11
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def read(self, n=-1):
+        return self.data.read(n)
+
+    def tell(self):
+        return self.data.tell()
+
+    def seek(self, offset, whence=0):
+        return self.data.seek(offset, whence)
+
+
+def test_by_extension():
+    registry = compression.OpenerRegistry([
+        compression.OpenerRecord(gzip.GzipFile, 'gz', b'\037\213'),
+    ])
+    registry.add(open, '.xz', None)
+    assert registry.by_extension('.gz').opener is gzip.GzipFile
+    assert registry.by_extension('gz').opener is gzip.GzipFile
+    assert registry.by_extension('.xz').opener is open
+    assert registry.by_extension('xz').opener is open
+    assert registry.by_extension('.mzML') is None
+
+    fd, path = tempfile.mkstemp(suffix='.gz')
+    os.close(fd)
+    try:
+        assert registry.get(path) is gzip.GzipFile
+    finally:
+        os.remove(path)
+
+
+def test_sniff_unseekable_stream():
+    payload = gzip.compress(b"<mzML/>")
+    stream = io.BufferedReader(UnseekableStream(payload))
+    assert compression.get(stream) is gzip.GzipFile
+    # Peeking must not consume anything from the stream
+    assert stream.read() == payload
+
+    stream = io.BufferedReader(UnseekableStream(b"<mzML/>"))
+    assert compression.get(stream) is open
+
+
+def test_sniff_stream_without_seekable():
+    stream = LegacySeekableStream(gzip.compress(b"<mzML/>"))
+    stream.read(3)
+    assert compression.get(stream) is gzip.GzipFile
+    assert stream.tell() == 3
+
+    stream = LegacySeekableStream(b"<mzML/>")
+    assert compression.get(stream) is open
@@ -1,3 +1,4 @@
+import io
 import os
 from psims import load_psims
 from psims.controlled_vocabulary import OBOCache, ControlledVocabulary
@@ -19,6 +20,13 @@
 obo_cache = OBOCache(cache_path)
 
 
+def _make_test_cv(stanzas, imports=(), **kwargs):
+    header = ['format-version: 1.2', 'ontology: test']
+    header.extend('import: %s' % url for url in imports)
+    text = '\n'.join(header) + '\n\n' + stanzas
+    return ControlledVocabulary.from_obo(io.BytesIO(text.encode('utf8')), **kwargs)
+
+
 def test_version():
     assert cv.version is not None
 
@@ -49,3 +57,358 @@ def test_cache_resolve():
     new_cv = ControlledVocabulary.from_obo(new_cv_file)
     assert new_cv.version is not None
     assert new_cv['m/z array'] == cv['m/z array']
+
+
+def test_cache_load_pickled():
+    uri = "http://purl.obolibrary.org/obo/ms/psi-ms.obo"
+    pickle_cache_path = tempfile.mkdtemp()
+    try:
+        first = OBOCache(pickle_cache_path, use_remote=False, precompiled=True).load(uri)
+        assert os.path.exists(os.path.join(pickle_cache_path, "psi-ms.obo.pkl"))
+        second = OBOCache(pickle_cache_path, use_remote=False, precompiled=True).load(uri)
+        assert second is not first
+        assert len(first) == len(second)
+        assert second['m/z array'] == first['m/z array']
+        assert second['ion injection time'].value_type('2.5') == 2.5
+    finally:
+        shutil.rmtree(pickle_cache_path)
+
+
+def test_cache_not_pickled_by_default():
+    uri = "http://purl.obolibrary.org/obo/ms/psi-ms.obo"
+    pickle_cache_path = tempfile.mkdtemp()
+    try:
+        OBOCache(pickle_cache_path, use_remote=False).load(uri)
+        assert os.path.exists(os.path.join(pickle_cache_path, "psi-ms.obo"))
+        assert not os.path.exists(os.path.join(pickle_cache_path, "psi-ms.obo.pkl"))
+    finally:
+        shutil.rmtree(pickle_cache_path)
+
+
+def test_prefetch_cvs():
+    from psims.controlled_vocabulary.controlled_vocabulary import prefetch_cvs, load_uo
+    loaded = prefetch_cvs(["psi-ms", "uo"])
+    assert loaded["psi-ms"] is load_psims()
+    assert loaded["uo"] is load_uo()
+
+
+def test_cache_pickle_invalidated():
+    uri = "http://purl.obolibrary.org/obo/ms/psi-ms.obo"
+    pickle_cache_path = tempfile.mkdtemp()
+    try:
+        cache = OBOCache(pickle_cache_path, use_remote=False, precompiled=True)
+        cache.load(uri)
+        obo_path = cache.path_for(uri)
+        stat = os.stat(obo_path)
+        os.utime(obo_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert cache._load_pickled(uri) is None
+    finally:
+        shutil.rmtree(pickle_cache_path)
+
+
+def test_cache_load_shared():
+    cache = OBOCache(enabled=False, use_remote=False)
+    uri = "http://purl.obolibrary.org/obo/uo.obo"
+    assert cache.load(uri) is cache.load(uri)
+
+
+def test_cache_load_shared_threaded():
+    from concurrent.futures import ThreadPoolExecutor
+    cache = OBOCache(enabled=False, use_remote=False)
+    uri = "http://purl.obolibrary.org/obo/uo.obo"
+    with ThreadPoolExecutor(4) as pool:
+        loaded = list(pool.map(cache.load, [uri] * 4))
+    assert all(cv is loaded[0] for cv in loaded)
+
+
+def test_query_imported():
+    stanzas = '''[Term]
+id: TEST:0000001
+name: test term
+'''
+    cache = OBOCache(enabled=False, use_remote=False)
+    test_cv = _make_test_cv(stanzas, imports=[
+        'http://ontologies.berkeleybop.org/pato.obo',
+        'http://purl.obolibrary.org/obo/uo.obo',
+    ], import_resolver=cache.load)
+    assert test_cv['UO:0000010'].vocabulary.name == 'UO'
+    assert test_cv['PATO:0000014'].id == 'PATO:0000014'
+    assert test_cv._import_prefix_index['UO'].name == 'UO'
+
+
+def test_cache_load_url():
+    import http.server
+    import threading
+    from psims.controlled_vocabulary.vendor import _use_vendored_unit_obo
+    with _use_vendored_unit_obo() as fh:
+        payload = fh.read()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        uri = "http://127.0.0.1:%d/uo.obo" % server.server_port
+        # Downloaded through a requests session when requests is installed
+        uo = OBOCache(enabled=False).load(uri)
+        assert uo['UO:0000002'].name == 'mass unit'
+
+        # and through urlopen otherwise
+        cache = OBOCache(enabled=False)
+        cache._get_session = lambda: None
+        assert len(cache.load(uri)) == len(uo)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+
+def test_parse_leaves_handle_open():
+    handle = io.BytesIO(b"format-version: 1.2\nnot a header line\n")
+    try:
+        ControlledVocabulary.from_obo(handle)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("malformed header did not raise")
+    assert not handle.closed
+
+
+def test_parse_self_closing_stream():
+    class SelfClosingStream(io.RawIOBase):
+        # Closes once its last byte is read, like an HTTP response
+        def __init__(self, data):
+            self.data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            chunk = self.data.read(len(buffer))
+            buffer[:len(chunk)] = chunk
+            if self.data.tell() == len(self.data.getbuffer()):
+                self.close()
+            return len(chunk)
+
+        def readline(self, size=-1):
+            line = self.data.readline(size)
+            if self.data.tell() == len(self.data.getbuffer()):
+                self.close()
+            return line
+
+    stream = SelfClosingStream(b"format-version: 1.2\nontology: test\n\n[Term]\nid: T:1\nname: term\n")
+    test_cv = ControlledVocabulary.from_obo(stream)
+    assert test_cv['T:1'].name == 'term'
+
+
+def test_is_of_type_dangling_ancestor():
+    from psims.controlled_vocabulary.relationship import Reference
+    stanzas = '''[Term]
+id: T:1
+name: root term
+is_a: EXT:9 ! not in this vocabulary
+
+[Term]
+id: T:2
+name: middle term
+is_a: T:1 ! root term
+
+[Term]
+id: T:3
+name: leaf term
+is_a: T:2 ! middle term
+
+[Term]
+id: T:4
+name: other root
+'''
+    test_cv = _make_test_cv(stanzas)
+    leaf = test_cv['T:3']
+    assert leaf.is_of_type('T:3')
+    assert leaf.is_of_type('T:2')
+    assert leaf.is_of_type('T:1')
+    assert not leaf.is_of_type('T:4')
+    assert not leaf.is_of_type('EXT:9')
+
+    # Re-parenting a term updates what its descendants report
+    test_cv['T:2']['is_a'] = Reference('T:4', 'other root')
+    assert leaf.is_of_type('T:4')
+    assert not leaf.is_of_type('T:1')
+
+
+def test_is_of_type_versions_per_vocabulary():
+    stanzas = '''[Term]
+id: T:1
+name: root term
+
+[Term]
+id: T:2
+name: leaf term
+is_a: T:1 ! root term
+'''
+    test_cv = _make_test_cv(stanzas)
+    leaf = test_cv['T:2']
+    assert leaf.is_of_type('T:1')
+    memoized = leaf._ancestors
+    # Loading another vocabulary or editing relationships leaves the memoized sets alone
+    _make_test_cv(stanzas)
+    leaf.add_relationship("part_of T:1 ! root term")
+    leaf.is_of_type('T:1')
+    assert leaf._ancestors is memoized
+
+
+def test_is_of_type_during_closure():
+    from psims.controlled_vocabulary.relationship import Reference
+    stanzas = '''[Term]
+id: T:1
+name: root term
+
+[Term]
+id: T:2
+name: middle term
+is_a: T:1 ! root term
+
+[Term]
+id: T:3
+name: leaf term
+is_a: T:2 ! middle term
+'''
+    test_cv = _make_test_cv(stanzas)
+    leaf = test_cv['T:3']
+    answers = []
+
+    class ProbingTerms(dict):
+        # Stands in for another thread asking about the leaf while its ancestors
+        # are still being collected, when the middle term looks up its parent
+        def get(self, key, default=None):
+            if isinstance(key, Reference) and key == 'T:1' and not answers:
+                answers.append(None)
+                answers.append(leaf.is_of_type('T:1'))
+            return super().get(key, default)
+
+    test_cv._terms = ProbingTerms(test_cv._terms)
+    assert leaf.is_of_type('T:1')
+    assert answers == [None, True]
+
+
+def test_is_of_type_imported_ancestor():
+    stanzas = '''[Term]
+id: TEST:0000001
+name: local parent
+
+[Term]
+id: TEST:0000002
+name: test unit
+is_a: TEST:0000001 ! local parent
+is_a: UO:0000002 ! mass unit
+'''
+    cache = OBOCache(enabled=False, use_remote=False)
+    resolved = []
+
+    def import_resolver(url):
+        resolved.append(url)
+        return cache.load(url)
+
+    test_cv = _make_test_cv(
+        stanzas, imports=['http://purl.obolibrary.org/obo/uo.obo'], import_resolver=import_resolver)
+    term = test_cv['TEST:0000002']
+    # A local ancestor is found without loading the imported vocabulary
+    assert term.is_of_type('TEST:0000001')
+    assert resolved == []
+    assert term.is_of_type('UO:0000002')
+    assert term.is_of_type('UO:0000000')
+    assert not term.is_of_type('UO:0000003')
+
+
+def test_add_relationship():
+    stanzas = '''[Term]
+id: T:1
+name: unit
+
+[Term]
+id: T:2
+name: measurement
+'''
+    test_cv = _make_test_cv(stanzas)
+    term = test_cv['T:2']
+    assert term['relationship'] == []
+    rel = term.add_relationship("has_units T:1 ! unit")
+    assert list(term.relationship) == [rel]
+    assert term['has_units'] == [rel]
+    term.remove_relationship(rel)
+    assert list(term.relationship) == []
+    assert term['has_units'] == []
+
+
+def test_predicate_list():
+    from psims.controlled_vocabulary.entity import Entity, PredicateList
+    term = Entity(id='T:2', name='measurement')
+    rels = [term.add_relationship(r) for r in ("has_units T:1 ! unit", "part_of T:3 ! whole")]
+    members = PredicateList(rels, term)
+    members[0] = "has_order T:4 ! order"
+    assert [r.accession for r in term.relationship] == ['T:3', 'T:4']
+    del members[0]
+    assert [r.accession for r in members] == ['T:3']
+    assert [r.accession for r in term.relationship] == ['T:3']
+
+    # Slices add and remove each of their relationships
+    members[:] = ["has_units T:1 ! unit", "has_order T:4 ! order", "part_of T:5 ! whole"]
+    assert [r.accession for r in term.relationship] == ['T:1', 'T:4', 'T:5']
+    assert term['part_of'] == [members[2]]
+    del members[::2]
+    assert [r.accession for r in members] == ['T:4']
+    assert [r.accession for r in term.relationship] == ['T:4']
+    try:
+        members[::-1] = ["has_units T:1 ! unit", "part_of T:3 ! whole"]
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("extended slice assignment of the wrong size did not raise")
+    assert [r.accession for r in term.relationship] == ['T:4']
+
+
+
+def test_relationship_list_mutators():
+    stanzas = '''[Term]
+id: T:2
+name: measurement
+relationship: has_units T:1 ! unit
+relationship: part_of T:3 ! whole
+relationship: has_order T:4 ! order
+'''
+    term = _make_test_cv(stanzas)['T:2']
+    popped = term.relationship.pop()
+    assert popped.accession == 'T:4'
+    assert term['has_order'] == []
+    term.relationship.remove('T:1')
+    assert term['has_units'] == []
+    assert [r.accession for r in term.relationship] == ['T:3']
+
+    relationships = term.relationship
+    relationships.append("has_units T:1 ! unit")
+    relationships.insert(0, "has_order T:4 ! order")
+    relationships += ["part_of T:5 ! other whole"]
+    assert [r.accession for r in relationships] == ['T:4', 'T:3', 'T:1', 'T:5']
+    assert sorted(r.accession for r in term.relationship) == ['T:1', 'T:3', 'T:4', 'T:5']
+    assert [r.accession for r in term['part_of']] == ['T:3', 'T:5']
+    relationships.clear()
+    assert list(term.relationship) == []
+    assert term['part_of'] == [] and term['has_units'] == [] and term['has_order'] == []
+
+def test_value_type_follows_data():
+    from psims.controlled_vocabulary.entity import Entity
+    from psims.controlled_vocabulary.type_definition import TypeDefinition
+    term = Entity(id='T:1', name='count', has_value_type=[TypeDefinition('xsd:int', 'int', int)])
+    value_type = term.value_type
+    assert value_type('2') == 2
+    term.data = dict(term.data, has_value_type=[TypeDefinition('xsd:float', 'float', float)])
+    assert value_type('2') == 2.0 and isinstance(value_type('2'), float)
@@ -49,5 +49,42 @@ def test_mzml_pipe_transformed():
     super(UnclosableBuffer, buff).close()
 
 
+def test_mzml_pipe_threaded():
+    buff = UnclosableBuffer()
+    path = datafile("small.mzML")
+    st = mzml.MzMLTransformer(path, buff, transform, "custom transform", n_workers=3)
+    st.write()
+    buff.close()
+
+    buff.seek(0)
+    test_reader = mzml.MzMLParser(buff)
+    ref_reader = st.reader
+    ref_reader.reset()
+
+    for ref_spec, test_spec in itertools.zip_longest(ref_reader, test_reader):
+        assert ref_spec['id'] == test_spec['id']
+        assert test_spec['peaks above mean intensity']
+    super(UnclosableBuffer, buff).close()
+
+
+def test_mzml_missing_term_category():
+    buff = UnclosableBuffer()
+    path = datafile("small.mzML")
+    st = mzml.MzMLTransformer(path, buff)
+    assert st._term_ids_of_type("not a real term category") == set()
+    assert "MS:1000511" in st._term_ids_of_type("spectrum attribute")
+    super(UnclosableBuffer, buff).close()
+
+
+def test_mzml_read_metadata_sections():
+    buff = UnclosableBuffer()
+    path = datafile("small.mzML")
+    st = mzml.MzMLTransformer(path, buff)
+    sections = st.read_metadata_sections()
+    assert set(sections) == set(st.metadata_sections)
+    assert sections == st._read_metadata_sections_separately()
+    super(UnclosableBuffer, buff).close()
+
+
 if __name__ == '__main__':
     test_mzml_pipe()
@@ -51,7 +51,12 @@ def transform_drop_ms2(spectrum):
 
 
 """
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from numbers import Number
+
+from lxml import etree
 from pyteomics import mzml
 
 from psims import MzMLWriter, MzMLbWriter
@@ -78,6 +83,20 @@ def identity(x):
     return x
 
 
+# Maps the accessions of selected ion parameters to the precursor information
+# field that they populate.
+_precursor_ion_fields = {
+    "MS:1000744": "mz",  # selected ion m/z
+    "MS:1000042": "intensity",  # peak intensity
+    "MS:1000041": "charge",  # charge state
+    "MS:1000633": "charge",  # possible charge state
+}
+
+# Stands in for the parameters of a precursor without an activation, so that no new
+# empty container is made for each one.
+_EMPTY = ()
+
+
 class MzMLTransformer(TransformerBase):
     """
     Reads an mzML file stream from :attr:`input_stream`, copying its metadata
@@ -102,6 +121,10 @@ class MzMLTransformer(TransformerBase):
         returns :const:`None`.
     transform_description : :class:`str`
         A description of the transformation to include in the written metadata
+    n_workers : :class:`int`
+        The number of threads used to transform and format spectra while the input
+        is being read and the output written. If this is less than two, spectra are
+        processed serially.
 
     Parameters
     ----------
@@ -116,10 +139,20 @@ class MzMLTransformer(TransformerBase):
         A description of the transformation to include in the written metadata
     sort_by_scan_time : :class:`bool`
         Whether or not to sort spectra by scan time prior to writing
+    n_workers : :class:`int`, optional
+        The number of threads to use to transform and format spectra concurrently.
+        When more than one thread is used, :attr:`transform` must be thread-safe.
+        Spectra are still written in their original order. Defaults to processing
+        spectra serially.
     """
 
+    metadata_sections = (
+        "fileDescription", "referenceableParamGroupList", "softwareList",
+        "instrumentConfigurationList", "dataProcessingList",
+    )
+
     def __init__(self, input_stream, output_stream, transform=None, transform_description=None,
-                 sort_by_scan_time=False):
+                 sort_by_scan_time=False, n_workers=None):
         if transform is None:
             transform = identity
         self.input_stream = input_stream
@@ -127,22 +160,100 @@ def __init__(self, input_stream, output_stream, transform=None, transform_descri
         self.transform = transform
         self.transform_description = transform_description
         self.sort_by_scan_time = sort_by_scan_time
+        self.n_workers = n_workers
         self.reader = MzMLParser(input_stream, iterative=True)
         self.writer = MzMLWriter(output_stream)
         self.psims_cv = self.writer.get_vocabulary('PSI-MS').vocabulary
+        self._build_term_type_index()
 
-    def format_referenceable_param_groups(self):
-        self.reader.reset()
+    def _term_ids_of_type(self, type_name):
+        '''Collect the accessions of the term named `type_name` and all
+        of its descendants in :attr:`psims_cv`.
+        '''
+        term_ids = set()
         try:
-            param_list = next(self.reader.iterfind("referenceableParamGroupList", recursive=True, retrive_refs=False))
-            param_groups = ensure_iterable(param_list.get("referenceableParamGroup", []))
-        except StopIteration:
-            param_groups = []
-        return [self.writer.ReferenceableParamGroup.ensure(d) for d in param_groups]
+            root = self.psims_cv[type_name]
+        except KeyError:
+            # Older releases of PSI-MS may not define every category
+            return term_ids
+        stack = [root]
+        while stack:
+            term = stack.pop()
+            if term.id in term_ids:
+                continue
+            term_ids.add(term.id)
+            stack.extend(term.children)
+        return term_ids
+
+    def _build_term_type_index(self):
+        # Spectra draw their params from a small set of terms, so memoize resolving
+        # them instead of going through the vocabulary's query logic every time.
+        self._term = lru_cache(maxsize=8192)(self.psims_cv.__getitem__)
+        # Resolving term categories with :meth:`~.Entity.is_of_type` walks the
+        # ancestry of each term for every spectrum, so compute the membership of
+        # each category once up front.
+        self._spectrum_representation_ids = self._term_ids_of_type("spectrum representation")
+        self._spectrum_attribute_ids = (
+            self._term_ids_of_type("spectrum property") | self._term_ids_of_type("spectrum attribute"))
+        self._scan_attribute_ids = self._term_ids_of_type("scan attribute")
+        self._selection_window_attribute_ids = self._term_ids_of_type("selection window attribute")
+
+    def read_metadata_sections(self):
+        '''Read all of the metadata sections of the mzML header which are
+        copied to the output document in a single pass over the file, stopping
+        at the start of the ``<run>`` element.
+
+        Returns
+        -------
+        :class:`dict`
+            A mapping from element name to the parsed element, for each section
+            in :attr:`metadata_sections` found in the header.
+        '''
+        # The single pass converts elements with the reader's private parsing method,
+        # so fall back to reading each section with the public API without it.
+        get_info = getattr(self.reader, '_get_info_smart', None)
+        if get_info is None:
+            return self._read_metadata_sections_separately()
+        sections = {}
+        self.reader.reset()
+        for event, elem in etree.iterparse(self.reader, events=('start', 'end'), remove_comments=True,
+                                           huge_tree=getattr(self.reader, '_huge_tree', False)):
+            name = etree.QName(elem).localname
+            if event == 'start':
+                if name == 'run':
+                    break
+            elif name in self.metadata_sections:
+                sections[name] = get_info(elem, recursive=True)
+                if len(sections) == len(self.metadata_sections):
+                    break
+        self.reader.reset()
+        return sections
 
-    def format_instrument_configuration(self):
+    def _read_metadata_sections_separately(self):
+        sections = {}
+        for name in self.metadata_sections:
+            self.reader.reset()
+            section = next(self.reader.iterfind(name, recursive=True), None)
+            if section is not None:
+                sections[name] = section
         self.reader.reset()
-        configuration_list = next(self.reader.iterfind("instrumentConfigurationList", recursive=True))
+        return sections
+
+    def format_referenceable_param_groups(self, param_list=None):
+        if param_list is None:
+            self.reader.reset()
+            try:
+                param_list = next(self.reader.iterfind("referenceableParamGroupList", recursive=True,
+                                                       retrive_refs=False))
+            except StopIteration:
+                param_list = {}
+        param_groups = ensure_iterable(param_list.get("referenceableParamGroup", []))
+        return [self.writer.ReferenceableParamGroup.ensure(d) for d in param_groups]
+
+    def format_instrument_configuration(self, configuration_list=None):
+        if configuration_list is None:
+            self.reader.reset()
+            configuration_list = next(self.reader.iterfind("instrumentConfigurationList", recursive=True))
         configurations = []
         for config_dict in configuration_list.get("instrumentConfiguration", []):
             components = []
@@ -162,9 +273,10 @@ def format_instrument_configuration(self):
             configurations.append(configuration)
         return configurations
 
-    def format_data_processing(self):
-        self.reader.reset()
-        dpl = next(self.reader.iterfind("dataProcessingList", recursive=True))
+    def format_data_processing(self, dpl=None):
+        if dpl is None:
+            self.reader.reset()
+            dpl = next(self.reader.iterfind("dataProcessingList", recursive=True))
         data_processing = []
         for dp_dict in dpl.get("dataProcessing", []):
             methods = []
@@ -176,26 +288,26 @@ def format_data_processing(self):
         return data_processing
 
     def copy_metadata(self):
-        self.reader.reset()
-        file_description = next(self.reader.iterfind("fileDescription"))
+        sections = self.read_metadata_sections()
+        file_description = sections["fileDescription"]
         source_files = file_description.get("sourceFileList").get('sourceFile')
         self.writer.file_description(file_description.get("fileContent", {}).items(), source_files)
 
-        param_groups = self.format_referenceable_param_groups()
+        param_groups = self.format_referenceable_param_groups(
+            sections.get("referenceableParamGroupList", {}))
         if param_groups:
             self.writer.reference_param_group_list(param_groups)
 
-        self.reader.reset()
-        software_list = next(self.reader.iterfind("softwareList"))
+        software_list = sections["softwareList"]
         software_list = software_list.get("software", [])
         software_list.append(self._make_software())
         self.writer.software_list(software_list)
 
-        configurations = self.format_instrument_configuration()
+        configurations = self.format_instrument_configuration(sections["instrumentConfigurationList"])
         self.writer.instrument_configuration_list(configurations)
 
         # include transformation description here
-        data_processing = self.format_data_processing()
+        data_processing = self.format_data_processing(sections["dataProcessingList"])
         data_processing.append(self._make_data_processing_entry())
         self.writer.data_processing_list(data_processing)
 
@@ -227,41 +339,40 @@ def format_scan(self, scan):
         scan_window_list = []
         scan_start_time = None
 
-        temp = scan.copy()
-
-        for key, value in list(temp.items()):
+        for key, value in scan.items():
             if not hasattr(key, 'accession'):
                 continue
             accession = key.accession
+            unit_info = getattr(value, 'unit_info', None)
             if accession == '' or accession is None:
                 scan_params.append({key: value})
-                if hasattr(value, 'unit_info'):
-                    scan_params[-1]['unit_name'] = value.unit_info
-                temp.pop(key)
+                if unit_info is not None:
+                    scan_params[-1]['unit_name'] = unit_info
                 continue
-            term = self.psims_cv[accession]
-            if term.is_of_type("scan attribute"):
+            term = self._term(accession)
+            if term.id in self._scan_attribute_ids:
                 if term.name == 'scan start time':
                     scan_start_time = {
-                        "name": term.id, "value": value, "unit_name": getattr(value, 'unit_info', None)
+                        "name": term.id, "value": value, "unit_name": unit_info
                     }
                 else:
                     scan_params.append({"name": term.id, "value": value})
-                    if hasattr(value, 'unit_info'):
-                        scan_params[-1]['unit_name'] = value.unit_info
-                temp.pop(key)
-        temp = temp.get('scanWindowList', {}).get('scanWindow', [{}])[0].copy()
-        for key, value in list(temp.items()):
+                    if unit_info is not None:
+                        scan_params[-1]['unit_name'] = unit_info
+        window_list = scan.get('scanWindowList')
+        scan_windows = window_list.get('scanWindow') if window_list else None
+        scan_window = scan_windows[0] if scan_windows else {}
+        for key, value in scan_window.items():
             if not hasattr(key, 'accession'):
                 continue
             accession = key.accession
-            term = self.psims_cv[accession]
-            if term.is_of_type("selection window attribute"):
+            term = self._term(accession)
+            if term.id in self._selection_window_attribute_ids:
                 scan_window_list.append(
                     {"name": term.id, "value": value})
-                if hasattr(value, 'unit_info'):
-                    scan_window_list[-1]['unit_name'] = value.unit_info
-                temp.pop(key)
+                unit_info = getattr(value, 'unit_info', None)
+                if unit_info is not None:
+                    scan_window_list[-1]['unit_name'] = unit_info
 
         scan_window_list.sort(key=lambda x: x['value'])
         if len(scan_window_list) % 2 == 0:
@@ -280,17 +391,19 @@ def format_scan(self, scan):
         return scan_start_time, scan_params, scan_window_list
 
     def format_spectrum(self, spectrum):
-        spec_data = dict()
-        spec_data["mz_array"] = spectrum.pop("m/z array", None)
-        spec_data["intensity_array"] = spectrum.pop("intensity array", None)
-        spec_data["charge_array"] = spectrum.pop("charge array", None)
-
-        spec_data['encoding'] = {
-            "m/z array": spec_data["mz_array"].dtype.type if spec_data.get('mz_array') is not None else None,
-            "intensity array": spec_data["intensity_array"].dtype.type if spec_data.get(
-                'intensity_array') is not None else None,
-            "charge array": spec_data["charge_array"].dtype.type if spec_data.get(
-                'charge_array') is not None else None
+        mz_array = spectrum.pop("m/z array", None)
+        intensity_array = spectrum.pop("intensity array", None)
+        charge_array = spectrum.pop("charge array", None)
+
+        spec_data = {
+            "mz_array": mz_array,
+            "intensity_array": intensity_array,
+            "charge_array": charge_array,
+            "encoding": {
+                "m/z array": mz_array.dtype.type if mz_array is not None else None,
+                "intensity array": intensity_array.dtype.type if intensity_array is not None else None,
+                "charge array": charge_array.dtype.type if charge_array is not None else None,
+            },
         }
 
         spec_data['id'] = spectrum["id"]
@@ -303,10 +416,9 @@ def format_spectrum(self, spectrum):
         else:
             spec_data['polarity'] = None
 
-        temp = spectrum.copy()
         attrs_to_skip = {'id', 'index', 'sourceFileRef',
                  'defaultArrayLength', 'dataProcessingRef', 'count'}
-        for key, value in list(temp.items()):
+        for key, value in spectrum.items():
             accession = None
             if not hasattr(key, 'accession'):
                 # Guess if this is looks like it could be a param tag or was added by the user
@@ -320,31 +432,32 @@ def format_spectrum(self, spectrum):
                     continue
             else:
                 accession = key.accession
+            unit_info = getattr(value, 'unit_info', None)
             if accession == '' or accession is None:
                 if isinstance(value, dict):
                     params.append(value)
                 else:
                     params.append({key: value})
-                if hasattr(value, 'unit_info'):
-                    params[-1]['unit_name'] = value.unit_info
-                temp.pop(key)
+                if unit_info is not None:
+                    params[-1]['unit_name'] = unit_info
             else:
-                term = self.psims_cv[accession]
-                if term.is_of_type("spectrum representation"):
+                term = self._term(accession)
+                if term.id in self._spectrum_representation_ids:
                     spec_data["centroided"] = term.id == "MS:1000127"
-                    temp.pop(key)
-                elif term.is_of_type("spectrum property") or term.is_of_type("spectrum attribute"):
+                elif term.id in self._spectrum_attribute_ids:
                     params.append({"name": term.id, "value": value})
-                    if hasattr(value, 'unit_info'):
-                        params[-1]['unit_name'] = value.unit_info
-                    temp.pop(key)
+                    if unit_info is not None:
+                        params[-1]['unit_name'] = unit_info
 
+        scan_list = spectrum.get("scanList")
+        scans = scan_list.get("scan") if scan_list else None
         spec_data["scan_start_time"], spec_data['scan_params'], spec_data["scan_window_list"] = self.format_scan(
-            spectrum.get("scanList", {}).get('scan', [{}])[0])
+            scans[0] if scans else {})
 
         spec_data['params'] = params
 
-        precursors = spectrum.get("precursorList", {}).get("precursor")
+        precursor_list = spectrum.get("precursorList")
+        precursors = precursor_list.get("precursor") if precursor_list else None
         if precursors:
             precursor_list = []
             for prec in precursors:
@@ -352,20 +465,16 @@ def format_spectrum(self, spectrum):
                 precursor_information['scan_id'] = prec.get("spectrumRef")
                 ion = prec['selectedIonList'].get("selectedIon")[0]
                 for key, value in list(ion.items()):
-                    term = self.psims_cv[key]
-                    if term.id == "MS:1000744":
-                        precursor_information['mz'] = value
-                        ion.pop(key)
-                    elif term.id == "MS:1000042":
-                        precursor_information['intensity'] = value
-                        ion.pop(key)
-                    elif term.id in ("MS:1000041", "MS:1000633"):
-                        precursor_information['charge'] = value
+                    accession = getattr(key, 'accession', None) or self._term(key).id
+                    field = _precursor_ion_fields.get(accession)
+                    if field is not None:
+                        precursor_information[field] = value
                         ion.pop(key)
                 precursor_information.setdefault("intensity", None)
                 precursor_information.setdefault("charge", None)
                 precursor_information['params'] = ion.items()
-                precursor_information['activation'] = (prec.get('activation', {}).items())
+                activation = prec.get('activation')
+                precursor_information['activation'] = activation.items() if activation else _EMPTY
                 precursor_information['isolation_window_args'] = prec.get("isolationWindow", None)
                 precursor_list.append(precursor_information)
 
@@ -373,11 +482,8 @@ def format_spectrum(self, spectrum):
             precursor_list = None
         spec_data['precursor_information'] = precursor_list
         # attempt to find the instrumentConfiguration id to reference
-        try:
-            spec_data['instrument_configuration_id'] = spectrum.get(
-                "scanList", {}).get("scan")[0].get("instrumentConfigurationRef")
-        except IndexError:
-            pass
+        if scans:
+            spec_data['instrument_configuration_id'] = scans[0].get("instrumentConfigurationRef")
         return spec_data
 
     def iterspectrum(self):
@@ -395,6 +501,42 @@ def iterspectrum(self):
         else:
             return self.reader.iterfind("spectrum")
 
+    def _process_spectrum(self, spectrum):
+        spectrum = self.transform(spectrum)
+        if spectrum is None:
+            return None
+        return self.format_spectrum(spectrum)
+
+    def iterprocessed(self):
+        '''Iterate over the spectra of :attr:`reader`, applying :attr:`transform`
+        and :meth:`format_spectrum` to each one.
+
+        If :attr:`n_workers` is greater than one, spectra are processed on a pool of
+        threads while the main thread continues reading, but are yielded in the same
+        order they were read in.
+
+        Yields
+        ------
+        :class:`dict` or :const:`None`
+            The formatted spectrum, or :const:`None` if :attr:`transform` dropped it.
+        '''
+        spectra = self.iterspectrum()
+        if self.n_workers is None or self.n_workers < 2:
+            for spectrum in spectra:
+                yield self._process_spectrum(spectrum)
+            return
+        # Bound the number of spectra in flight so that a slow writer doesn't let the
+        # whole file accumulate in memory.
+        max_pending = self.n_workers * 4
+        pending = deque()
+        with ThreadPoolExecutor(self.n_workers) as pool:
+            for spectrum in spectra:
+                pending.append(pool.submit(self._process_spectrum, spectrum))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     def write(self):
         '''Write out the the transformed mzML file
         '''
@@ -405,11 +547,10 @@ def write(self):
             with writer.run(id="transformation_run"):
                 with writer.spectrum_list(len(self.reader._offset_index)):
                     self.reader.reset()
-                    for i, spectrum in enumerate(self.iterspectrum()):
-                        spectrum = self.transform(spectrum)
+                    for i, spectrum in enumerate(self.iterprocessed()):
                         if spectrum is None:
                             continue
-                        self.writer.write_spectrum(**self.format_spectrum(spectrum))
+                        self.writer.write_spectrum(**spectrum)
                         if i % 1000 == 0:
                             self.log("Handled %d spectra" % (i, ))
                     self.log("Handled %d spectra" % (i, ))
@@ -433,6 +574,11 @@ class MzMLToMzMLb(MzMLTransformer):
         A description of the transformation to include in the written metadata
     sort_by_scan_time : :class:`bool`
         Whether or not to sort spectra by scan time prior to writing
+    n_workers : :class:`int`, optional
+        The number of threads to use to transform and format spectra concurrently.
+        When more than one thread is used, :attr:`transform` must be thread-safe.
+        Spectra are still written in their original order. Defaults to processing
+        spectra serially.
     h5_compression : :class:`str`, optional
         The name of the HDF5 compression method to use. Defaults to
         :const:`psims.mzmlb.writer.DEFAULT_COMPRESSOR`
@@ -447,7 +593,7 @@ class MzMLToMzMLb(MzMLTransformer):
     """
 
     def __init__(self, input_stream, output_stream, transform=None, transform_description=None,
-                 sort_by_scan_time=False, **hdf5args):
+                 sort_by_scan_time=False, n_workers=None, **hdf5args):
         if transform is None:
             transform = identity
         self.input_stream = input_stream
@@ -455,6 +601,8 @@ def __init__(self, input_stream, output_stream, transform=None, transform_descri
         self.transform = transform
         self.transform_description = transform_description
         self.sort_by_scan_time = sort_by_scan_time
+        self.n_workers = n_workers
         self.reader = MzMLParser(input_stream, iterative=True)
         self.writer = MzMLbWriter(output_stream, **hdf5args)
         self.psims_cv = self.writer.get_vocabulary('PSI-MS').vocabulary
+        self._build_term_type_index()
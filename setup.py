@@ -21,7 +21,8 @@
 
 extras_require = {
     'mzmlb': ['h5py', 'hdf5plugin'],
-    'numpress': ['pynumpress']
+    'numpress': ['pynumpress'],
+    'http': ['requests'],
 }
 extras_require['all'] = sum(extras_require.values(), [])
 